@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import argparse
+import datetime
+import subprocess
+
+# Allow running as "python benchmarks/bench.py" from the project root; nothing here needs pygame
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from search_algorithms.search_utility import parse_input
+from search_algorithms.budget import SearchBudget, BudgetExceeded
+from search_algorithms.measurement import MEASURE_NONE, MEASURE_TRACEMALLOC
+from process_algorithms import ALGORITHMS
+from puzzle_generator import generate_puzzle
+from result_sink import read_results, STATUS_SOLVED, STATUS_NO_SOLUTION, STATUS_BUDGET_EXCEEDED
+
+input_folder = os.path.join(project_root, "input")
+HISTORY_FILE = os.path.join(project_root, "benchmarks", "history.json")
+BASELINE_FILE = os.path.join(project_root, "benchmarks", "baseline.json")
+
+# (stones, lane length) of the generated scaling puzzles, smallest first
+LANE_SIZES = [(1, 6), (2, 6), (2, 10), (3, 8), (3, 12), (4, 10), (5, 10)]
+# (width, height, stones, layout) of the seeded random puzzles, smallest first
+GENERATED_SIZES = [(8, 8, 2, "scatter"), (10, 10, 2, "rooms"), (10, 10, 3, "scatter"), (12, 12, 3, "rooms"),
+                   (14, 14, 4, "scatter"), (16, 16, 4, "rooms"), (18, 18, 5, "scatter")]
+GENERATED_SEED = 0
+MIN_TIMED_SECONDS = 0.05  # Faster runs are all timer noise, so their nodes/s is not compared
+
+# One stone per horizontal lane, pushed from the left end onto the goal at the right end. Ares walks
+# between lanes along the open left column. The state space grows as lane length ** stones.
+def lane_puzzle(stones, length):
+    width = length + 2
+    grid = ["#" * width]
+    for i in range(stones):
+        if i > 0:
+            grid.append("# " + "#" * (width - 2))
+        grid.append("#" + ("@" if i == 0 else " ") + "$" + " " * (length - 3) + ".#")
+    grid.append("#" * width)
+    weights = [i + 1 for i in range(stones)]
+    return weights, [list(row) for row in grid]
+
+def bundled_puzzles():
+    for input_file in sorted(os.listdir(input_folder)):
+        if not input_file.endswith(".txt"):
+            continue
+        weights, grid, error_message = parse_input(os.path.join(input_folder, input_file))
+        if error_message:
+            print(error_message)
+            continue
+        yield input_file[:-4], weights, grid
+
+def scaling_puzzles():
+    for stones, length in LANE_SIZES:
+        weights, grid = lane_puzzle(stones, length)
+        yield f"lanes-{stones}x{length}", weights, grid
+
+def generated_puzzles():
+    for width, height, stones, layout in GENERATED_SIZES:
+        weights, grid = generate_puzzle(width, height, stones, GENERATED_SEED, layout)
+        yield f"gen-{layout}-{width}x{height}-{stones}", weights, grid
+
+PUZZLE_SETS = {"bundled": bundled_puzzles, "scaling": scaling_puzzles, "generated": generated_puzzles}
+
+# Time/throughput and memory come from separate runs: tracemalloc would distort the timings
+def run_job(search, weights, grid, max_time, measure_memory):
+    final_state, nodes, time_taken, _, _ = search(weights, grid, budget=SearchBudget(max_time=max_time), measure=MEASURE_NONE)
+    record = {
+        "nodes": nodes,
+        "time": round(time_taken, 6),
+        "nodes_per_second": round(nodes / max(time_taken, 1e-9), 1),
+    }
+    if isinstance(final_state, BudgetExceeded):
+        record["budget_exceeded"] = final_state.limit
+        return record
+    record["cost"] = final_state.cost if final_state else None
+    record["steps"] = len(final_state.path) if final_state else None
+    if measure_memory:
+        _, _, _, peak, _ = search(weights, grid, budget=SearchBudget(max_time=max_time), measure=MEASURE_TRACEMALLOC)
+        record["peak_memory"] = peak
+    return record
+
+# Bench records from a batch's results.jsonl (process_algorithms.py), keyed like the bundled jobs.
+# Cached results and errors carry no timing of this tree, so they are left out; memory is only kept
+# when the batch measured it with tracemalloc, like the memory pass of run_job.
+def records_from_results(path):
+    results = {}
+    for entry in read_results(path):
+        if entry["cached"] or entry["status"] not in (STATUS_SOLVED, STATUS_NO_SOLUTION, STATUS_BUDGET_EXCEEDED):
+            continue
+        record = {
+            "nodes": entry["nodes_generated"],
+            "time": round(entry["time_taken"], 6),
+            "nodes_per_second": round(entry["nodes_generated"] / max(entry["time_taken"], 1e-9), 1),
+        }
+        if entry["status"] == STATUS_BUDGET_EXCEEDED:
+            record["budget_exceeded"] = entry["budget"]["limit"]
+        else:
+            record["cost"] = entry["cost"]
+            record["steps"] = entry["steps"]
+            if entry["measure"] == MEASURE_TRACEMALLOC:
+                record["peak_memory"] = entry["memory_used"]
+        results[f"{os.path.splitext(entry['input_file'])[0]}/{entry['algorithm_key']}"] = record
+    return results
+
+def print_record(job, record):
+    peak = f"{record['peak_memory'] / 1024:.0f}" if "peak_memory" in record else "-"
+    cost = record.get("cost", f"({record.get('budget_exceeded')})")
+    print(f"{job:<34}{record['nodes']:>10}{record['time']:>10.3f}{record['nodes_per_second']:>10.0f}{peak:>10}{cost!s:>8}", flush=True)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+# Differences against the baseline worth a look: slower, hungrier, a different cost, or no longer finishing
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for job, record in results.items():
+        base = baseline.get(job)
+        if base is None:
+            continue
+        if "budget_exceeded" in record:
+            if "budget_exceeded" not in base:
+                regressions.append(f"{job}: now exceeds its {record['budget_exceeded']} budget")
+            continue
+        if "budget_exceeded" in base:
+            continue
+        if record["cost"] != base["cost"]:
+            regressions.append(f"{job}: cost {base['cost']} -> {record['cost']}")
+        if min(record["time"], base["time"]) >= MIN_TIMED_SECONDS and \
+                record["nodes_per_second"] < base["nodes_per_second"] * (1 - threshold):
+            regressions.append(f"{job}: {base['nodes_per_second']:.0f} -> {record['nodes_per_second']:.0f} nodes/s")
+        if "peak_memory" in record and "peak_memory" in base and \
+                record["peak_memory"] > base["peak_memory"] * (1 + threshold):
+            regressions.append(f"{job}: peak memory {base['peak_memory'] / 1024:.0f} -> {record['peak_memory'] / 1024:.0f} KB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms and track regressions.")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=["UCS", "BFS", "A_star"])
+    parser.add_argument("--puzzles", nargs="+", choices=list(PUZZLE_SETS), default=list(PUZZLE_SETS))
+    parser.add_argument("--max-time", type=float, default=60, help="seconds each run may take")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--history", default=HISTORY_FILE, help="JSON file every run is appended to")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="JSON file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--results", default=None,
+                        help="take the results of a process_algorithms.py batch (its results.jsonl) instead of running the searches")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'Job':<34}{'Nodes':>10}{'Time (s)':>10}{'Nodes/s':>10}{'Peak KB':>10}{'Cost':>8}")
+    if args.results:
+        results = records_from_results(args.results)
+        for job, record in results.items():
+            print_record(job, record)
+    else:
+        for puzzle_set in args.puzzles:
+            for name, weights, grid in PUZZLE_SETS[puzzle_set]():
+                for algorithm in args.algorithms:
+                    search = ALGORITHMS[algorithm][0]
+                    job = f"{name}/{algorithm}"
+                    record = run_job(search, weights, grid, args.max_time, not args.no_memory)
+                    results[job] = record
+                    print_record(job, record)
+
+    history = load_json(args.history, [])
+    history.append({
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "results": results,
+    })
+    save_json(args.history, history)
+
+    if args.save_baseline:
+        save_json(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_json(args.baseline, None)
+    if baseline is None:
+        print("No baseline yet; run with --save-baseline to create one.")
+        return 0
+    regressions = find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regressions against the baseline.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import os
+import sys
+import argparse
+
+# Allow running as "python benchmarks/frontier_throughput.py" from the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from search_algorithms.board import Board
+from search_algorithms.budget import SearchBudget, BudgetExceeded
+from search_algorithms.engine import best_first_search, HEAP, BUCKET, DUPLICATES_CLOSED, DUPLICATES_BEST
+from search_algorithms.A_star import compact_heuristic
+from search_algorithms.assignment import AssignmentHeuristic
+from search_algorithms.measurement import MEASURE_NONE, MEASURE_TRACEMALLOC
+from search_algorithms.search_utility import parse_input
+from puzzle_generator import generate_puzzle
+
+# (width, height, stones, layout, seed) of the puzzles run; UCS holds well over a million frontier entries on the
+# 18x18 one within six million nodes
+PUZZLES = [(16, 16, 4, "rooms", 0), (18, 18, 5, "scatter", 0)]
+
+def ucs_setup(board):
+    return lambda state, parent: state.cost, DUPLICATES_CLOSED
+
+def a_star_setup(board):
+    engine = AssignmentHeuristic(board)
+    return lambda state, parent: state.cost + compact_heuristic(state, board, engine, parent), DUPLICATES_BEST
+
+SEARCHES = {"UCS": ucs_setup, "A_star": a_star_setup}
+
+# (name, weights, grid) of the puzzles to run, with every stone weight multiplied by weight_scale
+def load_puzzles(bundled, weight_scale):
+    puzzles = []
+    if bundled:
+        input_folder = os.path.join(project_root, "input")
+        for input_file in sorted(f for f in os.listdir(input_folder) if f.endswith(".txt")):
+            weights, grid, error_message = parse_input(os.path.join(input_folder, input_file))
+            if not error_message:
+                puzzles.append((input_file[:-4], weights, grid))
+    else:
+        for width, height, stones, layout, seed in PUZZLES:
+            weights, grid = generate_puzzle(width, height, stones, seed, layout)
+            puzzles.append((f"gen-{layout}-{width}x{height}-{stones}", weights, grid))
+    return [(name, [weight * weight_scale for weight in weights], grid) for name, weights, grid in puzzles]
+
+def run(weights, grid, search, frontier, max_nodes, measure):
+    board = Board(weights, grid)
+    priority, duplicates = SEARCHES[search](board)
+    return best_first_search(board, frontier, priority, duplicates, budget=SearchBudget(max_nodes=max_nodes), measure=measure)
+
+# Same search with a binary heap and with the bucket queue, both cut off at the same node count (or solved),
+# so nodes/s compare like for like. Nodes and frontier size (what was still queued when the search stopped)
+# are those of the bucket run; A* may generate a few more or fewer nodes on the heap, which breaks ties by age.
+# With --memory each run is repeated under tracemalloc for its peak memory; the times come from the
+# untraced runs.
+def main():
+    parser = argparse.ArgumentParser(description="Compare heap and bucket-queue frontiers on large frontiers.")
+    parser.add_argument("--searches", nargs="+", choices=list(SEARCHES), default=list(SEARCHES))
+    parser.add_argument("--max-nodes", type=int, default=6000000, help="nodes each run may generate")
+    parser.add_argument("--bundled", action="store_true", help="run the maps in input/ instead of the generated puzzles")
+    parser.add_argument("--weight-scale", type=int, default=1, help="multiply every stone weight by this")
+    parser.add_argument("--memory", action="store_true", help="also report each frontier's peak memory")
+    args = parser.parse_args()
+
+    print(f"{'Puzzle':<26}{'Search':<8}{'Nodes':>10}{'Frontier':>10}{'Heap n/s':>10}{'Bucket n/s':>12}{'Speedup':>9}"
+          f"{'Heap s':>9}{'Bucket s':>10}{'Heap KB':>10}{'Bucket KB':>11}")
+    for name, weights, grid in load_puzzles(args.bundled, args.weight_scale):
+        for search in args.searches:
+            rates, times, memory = {}, {}, {}
+            for frontier in (HEAP, BUCKET):
+                final_state, nodes, time_taken, _, _ = run(weights, grid, search, frontier, args.max_nodes, MEASURE_NONE)
+                rates[frontier] = nodes / max(time_taken, 1e-9)
+                times[frontier] = time_taken
+                if args.memory:
+                    memory[frontier] = f"{run(weights, grid, search, frontier, args.max_nodes, MEASURE_TRACEMALLOC)[3] / 1024:.0f}"
+                else:
+                    memory[frontier] = "-"
+            frontier_size = final_state.frontier_size if isinstance(final_state, BudgetExceeded) else "solved"
+            print(f"{name:<26}{search:<8}{nodes:>10}{frontier_size!s:>10}{rates[HEAP]:>10.0f}{rates[BUCKET]:>12.0f}"
+                  f"{rates[BUCKET] / rates[HEAP]:>8.2f}x{times[HEAP]:>9.3f}{times[BUCKET]:>10.3f}{memory[HEAP]:>10}{memory[BUCKET]:>11}", flush=True)
+
+if __name__ == "__main__":
+    main()
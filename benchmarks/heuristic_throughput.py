@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Allow running as "python benchmarks/heuristic_throughput.py" from the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from search_algorithms.search_utility import parse_input
+from search_algorithms.A_star import a_star
+from search_algorithms.measurement import MEASURE_NONE
+
+input_folder = os.path.join(project_root, "input")
+
+# A* nodes/second with a full assignment solve per node ("before") against the incremental,
+# memoized engine ("after"). Both runs expand exactly the same nodes, and neither measures memory, so
+# tracemalloc's overhead stays out of the rates.
+def main():
+    print(f"{'Map':<14}{'Nodes':>8}{'Before n/s':>12}{'After n/s':>12}{'Speedup':>9}")
+    for input_file in sorted(os.listdir(input_folder)):
+        weights, grid, error_message = parse_input(os.path.join(input_folder, input_file))
+        if error_message:
+            continue
+        _, nodes, before_time, _, _ = a_star(weights, grid, incremental_heuristic=False, measure=MEASURE_NONE)
+        _, after_nodes, after_time, _, _ = a_star(weights, grid, measure=MEASURE_NONE)
+        before_rate = nodes / max(before_time, 1e-9)
+        after_rate = after_nodes / max(after_time, 1e-9)
+        print(f"{input_file:<14}{nodes:>8}{before_rate:>12.0f}{after_rate:>12.0f}{after_rate / before_rate:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import tracemalloc
+from collections import deque
+
+# Allow running as "python benchmarks/state_memory.py" from the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from search_algorithms.search_utility import *
+
+input_folder = os.path.join(project_root, "input")
+STATE_LIMIT = 200000  # Number of reachable states to hold in memory per map
+
+# Collect up to `limit` distinct reachable states (breadth-first) so both forms store the same set
+def reachable_states(weights, grid, limit):
+    codec = StateCodec(grid)
+    start = find_initial_state(grid)
+    queue = deque([start])
+    seen = {codec.pack(start.ares_pos, start.stones)}
+    states = []
+    while queue and len(states) < limit:
+        state = queue.popleft()
+        states.append(state)
+        for successor in get_successors(state, weights, grid):
+            key = codec.pack(successor.ares_pos, successor.stones)
+            if key not in seen:
+                seen.add(key)
+                queue.append(successor)
+    return codec, states
+
+# Bytes needed to keep every state as a frontier entry plus its visited key
+def measure(build):
+    tracemalloc.start()
+    held = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return size
+
+def legacy_form(states):
+    frontier = [State(s.ares_pos, s.stones[:], s.cost, s.path) for s in states]
+    visited = {(s.ares_pos, tuple(s.stones)) for s in frontier}
+    return frontier, visited
+
+def compact_form(codec, states):
+    frontier = [codec.compress(s) for s in states]
+    visited = {s.key for s in frontier}
+    return frontier, visited
+
+def main():
+    print(f"{'Map':<14}{'States':>9}{'Legacy KB':>12}{'Compact KB':>12}{'B/state':>16}{'Saved':>8}")
+    for input_file in sorted(os.listdir(input_folder)):
+        weights, grid, error_message = parse_input(os.path.join(input_folder, input_file))
+        if error_message:
+            continue
+        codec, states = reachable_states(weights, grid, STATE_LIMIT)
+        legacy = measure(lambda: legacy_form(states))
+        compact = measure(lambda: compact_form(codec, states))
+        per_state = f"{legacy // len(states)} -> {compact // len(states)}"
+        print(f"{input_file:<14}{len(states):>9}{legacy / 1024:>12.1f}{compact / 1024:>12.1f}"
+              f"{per_state:>16}{1 - compact / legacy:>8.0%}")
+
+if __name__ == "__main__":
+    main()
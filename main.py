@@ -1,22 +1,13 @@
 import pygame
-import os
-from ui.ui_utility import *
-from ui.main_menu import main_menu
-from process_algorithms import process_all_algorithms
-
-# Navigate to the project root and ensure input/output folders are set up
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-input_folder = os.path.join(project_root, "CS420-Project01", "input")
-output_folder = os.path.join(project_root, "CS420-Project01", "output")
 
+# The UI modules open the window as soon as they are imported, so they are only imported here: the background
+# solver's worker processes are started with "spawn" and import this module again without running main().
 def main():
-    # Run the algorithms
-    """print("Processing...")
-    process_all_algorithms(input_folder, output_folder)"""
-    
-    # Initialize Pygame after processing is complete
+    from ui.main_menu import main_menu
+
+    # Maps are solved on demand from the map selection screen, on a worker process (see ui/background_solver.py)
     pygame.init()
     main_menu()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
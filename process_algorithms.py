@@ -1,41 +1,171 @@
 import os
-from search_algorithms.UCS import UCS_process_input_files
-from search_algorithms.BFS import BFS_process_input_files
-from search_algorithms.DFS import DFS_process_input_files
-from search_algorithms.A_star import A_star_process_input_files
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from search_algorithms.budget import SearchBudget
+from search_algorithms.engine import solve_input_file, process_input_files
+from search_algorithms.measurement import MEASUREMENT_MODES, MEASURE_TRACEMALLOC
+from search_algorithms.progress import SearchProgress, ConsoleReporter, JsonlReporter
+from search_algorithms.UCS import uniform_cost_search
+from search_algorithms.BFS import bfs_search
+from search_algorithms.DFS import DFS_Search
+from search_algorithms.A_star import a_star
+from search_algorithms.IDA_star import ida_star
+from solution_cache import SolutionCache, CACHE_MAX_BYTES
+from result_sink import JsonlSink, RESULTS_FILE
 
-def write_results_to_folder(algorithm_name, results, output_folder):
+# How each pruning counter is labelled next to "Nodes Generated"
+PRUNING_LABELS = {"dead_squares": "dead squares", "freeze": "freeze", "blocks": "2x2 blocks"}
+
+# Output subfolder -> (search function, name written on the first line of each output)
+ALGORITHMS = {
+    "UCS": (uniform_cost_search, "Uniform Cost Search"),
+    "BFS": (bfs_search, "Breadth-First Search"),
+    "DFS": (DFS_Search, "Depth-First Search"),
+    "A_star": (a_star, "A Star Search"),
+    "IDA_star": (ida_star, "IDA Star Search"),
+}
+
+def format_pruned(pruned):
+    if not pruned:
+        return ""
+    counts = ", ".join(f"{PRUNING_LABELS.get(name, name)} {count}" for name, count in pruned.items())
+    return f" (Pruned: {counts})"
+
+def write_result(output_path, result):
+    with open(output_path, 'w') as f:
+        f.write(f"{result['algorithm']}\n")
+        if result['error_message']:
+            f.write(f"{result['error_message']}\n\n")
+        elif result.get('budget_exceeded'):
+            # Cut off by its budget: which limit, then whatever the search got through
+            exceeded = result['budget_exceeded']
+            f.write(f"{exceeded}\n")
+            f.write(f"Nodes Generated: {result['nodes_generated']}{format_pruned(result.get('pruned'))}\n")
+            if exceeded.frontier_size is not None:
+                f.write(f"Frontier Size: {exceeded.frontier_size}\n")
+            if exceeded.visited_size is not None:
+                f.write(f"Visited States: {exceeded.visited_size}\n")
+            f.write(f"Time Taken: {result['time_taken']:.4f} seconds\n")
+            f.write(f"Memory Used: {result['memory_used'] / 1024:.2f} KB\n\n")
+        elif isinstance(result['final_state'], str):
+            f.write(result['final_state'] + "\n\n")
+        else:
+            f.write(f"Steps: {len(result['final_state'].path)}\n")
+            f.write(f"Total Weight Pushed: {result['final_state'].cost}\n")
+            f.write(f"Nodes Generated: {result['nodes_generated']}{format_pruned(result.get('pruned'))}\n")
+            f.write(f"Time Taken: {result['time_taken']:.4f} seconds\n")
+            f.write(f"Memory Used: {result['memory_used'] / 1024:.2f} KB\n")
+            f.write(result['final_state'].path + "\n\n")
+
+def write_results_to_folder(algorithm_name, results, output_folder, sink=None):
     # Create the subfolder for the algorithm under the output folder
     algorithm_folder = os.path.join(output_folder, algorithm_name)
     os.makedirs(algorithm_folder, exist_ok=True)
-    
-    # Write results to the respective algorithm's folder
+
+    # Write results to the respective algorithm's folder, each as soon as it arrives when results is a generator
     for idx, result in enumerate(results):
         output_file = f"output-{idx + 1:02}.txt"
-        output_path = os.path.join(algorithm_folder, output_file)
-        with open(output_path, 'w') as f:
-            f.write(f"{result['algorithm']}\n")
-            if result['error_message']:
-                f.write(f"{result['error_message']}\n\n")
-            elif isinstance(result['final_state'], str):
-                f.write(result['final_state'] + "\n\n")
-            else:
-                f.write(f"Steps: {len(result['final_state'].path)}\n")
-                f.write(f"Total Weight Pushed: {result['final_state'].cost}\n")
-                f.write(f"Nodes Generated: {result['nodes_generated']}\n")
-                f.write(f"Time Taken: {result['time_taken']:.4f} seconds\n")
-                f.write(f"Memory Used: {result['memory_used'] / 1024:.2f} KB\n")
-                f.write(result['final_state'].path + "\n\n")
-
-def process_all_algorithms(input_folder, output_folder):
-    # Process input files with each search algorithm
-    ucs_results = UCS_process_input_files(input_folder)
-    bfs_results = BFS_process_input_files(input_folder)
-    dfs_results = DFS_process_input_files(input_folder)
-    a_star_results = A_star_process_input_files(input_folder)
-
-    # Write each algorithm's results to its own subfolder
-    write_results_to_folder("UCS", ucs_results, output_folder)
-    write_results_to_folder("BFS", bfs_results, output_folder)
-    write_results_to_folder("DFS", dfs_results, output_folder)
-    write_results_to_folder("A_star", a_star_results, output_folder)
\ No newline at end of file
+        write_result(os.path.join(algorithm_folder, output_file), result)
+        if sink:
+            sink.write(result)
+
+# Besides the text files, every result also goes to <output_folder>/results.jsonl (or results_path).
+# Each result is written as soon as its search finishes.
+def process_all_algorithms(input_folder, output_folder, budget=None, measure=MEASURE_TRACEMALLOC, cache=None, results_path=None,
+                           progress=None):
+    # Process input files with each search algorithm, writing its results to its own subfolder
+    with JsonlSink(results_path or os.path.join(output_folder, RESULTS_FILE)) as sink:
+        for algorithm, (search, algorithm_name) in ALGORITHMS.items():
+            results = process_input_files(search, algorithm_name, input_folder, budget=budget, measure=measure, progress=progress,
+                                          algorithm_key=algorithm, cache=cache)
+            write_results_to_folder(algorithm, results, output_folder, sink)
+
+# solve_input_file for a single (algorithm, input file) job, by the algorithm's key in ALGORITHMS.
+# Runs in a worker process, so everything it takes and returns has to pickle.
+# With progress, the search reports under the label "<algorithm>/<input file>".
+def process_input_file(algorithm, input_path, deadlock_detection=False, normalize_player=False, budget=None, measure=MEASURE_TRACEMALLOC,
+                       cache=None, progress=None):
+    search, algorithm_name = ALGORITHMS[algorithm]
+    return solve_input_file(search, algorithm_name, input_path, deadlock_detection, normalize_player, budget, measure, progress,
+                            algorithm, cache)
+
+# "Time Taken" of an earlier run of the same job, or None if it has not been run (or did not finish)
+def previous_time(output_path):
+    try:
+        with open(output_path, 'r') as f:
+            for line in f:
+                if line.startswith("Time Taken:"):
+                    return float(line.split(": ")[1].split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+# Run every (input file, algorithm) pair on a process pool. Jobs start longest first according to the
+# timings in the existing outputs (jobs never timed before go first), and each output file is written as
+# soon as its job finishes. Files are numbered like write_results_to_folder: by position in the sorted input listing.
+# Each finished job is also appended to the batch's JSONL results (<output_folder>/results.jsonl by default).
+def process_all_algorithms_parallel(input_folder, output_folder, algorithms=None, workers=None,
+                                    deadlock_detection=False, normalize_player=False, budget=None, measure=MEASURE_TRACEMALLOC,
+                                    cache=None, results_path=None, progress=None):
+    algorithms = list(algorithms or ALGORITHMS)
+    input_files = [name for name in sorted(os.listdir(input_folder))
+                   if name.endswith(".txt") and os.path.isfile(os.path.join(input_folder, name))]
+
+    jobs = []
+    for algorithm in algorithms:
+        algorithm_folder = os.path.join(output_folder, algorithm)
+        os.makedirs(algorithm_folder, exist_ok=True)
+        for idx, input_file in enumerate(input_files):
+            output_path = os.path.join(algorithm_folder, f"output-{idx + 1:02}.txt")
+            jobs.append((previous_time(output_path), algorithm, os.path.join(input_folder, input_file), output_path))
+    jobs.sort(key=lambda job: float('inf') if job[0] is None else job[0], reverse=True)
+
+    results = []
+    with JsonlSink(results_path or os.path.join(output_folder, RESULTS_FILE)) as sink, ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_input_file, algorithm, input_path, deadlock_detection, normalize_player, budget, measure, cache,
+                                   progress): output_path
+                   for _, algorithm, input_path, output_path in jobs}
+        for future in as_completed(futures):
+            result = future.result()
+            write_result(futures[future], result)
+            sink.write(result)
+            print(f"{result['algorithm']} on {result['input_file']} {'from cache' if result.get('cached') else 'done'}.")
+            results.append(result)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve every input map with the selected algorithms.")
+    parser.add_argument("--input", default="input", help="folder with the input-NN.txt maps")
+    parser.add_argument("--output", default="output", help="folder the <ALG>/output-NN.txt files go to")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--max-time", type=float, default=None, help="seconds each job may run")
+    parser.add_argument("--max-nodes", type=int, default=None, help="nodes each job may generate")
+    parser.add_argument("--max-rss", type=float, default=None, help="resident memory each job may use, in MB")
+    parser.add_argument("--measure", choices=MEASUREMENT_MODES, default=MEASURE_TRACEMALLOC,
+                        help="memory measurement: none for honest timings, rss or tracemalloc for memory figures")
+    parser.add_argument("--results", default=None, help="JSONL file the results are streamed to (default: <output>/results.jsonl)")
+    parser.add_argument("--progress", type=float, default=None, metavar="SECONDS", help="print search progress to stderr this often")
+    parser.add_argument("--progress-log", default=None, help="JSONL file every progress event is appended to")
+    parser.add_argument("--no-cache", action="store_true", help="solve everything again without reading or filling the cache")
+    parser.add_argument("--clear-cache", action="store_true", help="drop every cached solution before running")
+    parser.add_argument("--cache-size", type=float, default=CACHE_MAX_BYTES / (1024 * 1024), help="cache size limit in MB")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else SolutionCache(max_bytes=int(args.cache_size * 1024 * 1024))
+    if args.clear_cache:
+        (cache or SolutionCache()).clear()
+
+    budget = None
+    if args.max_time is not None or args.max_nodes is not None or args.max_rss is not None:
+        max_rss = int(args.max_rss * 1024 * 1024) if args.max_rss is not None else None
+        budget = SearchBudget(args.max_time, args.max_nodes, max_rss)
+
+    progress = None
+    if args.progress is not None or args.progress_log:
+        reporters = [ConsoleReporter()] if args.progress is not None else []
+        if args.progress_log:
+            reporters.append(JsonlReporter(args.progress_log))
+        progress = SearchProgress(*reporters, interval=args.progress if args.progress is not None else 1.0)
+    process_all_algorithms_parallel(args.input, args.output, args.algorithms, args.workers, budget=budget, measure=args.measure, cache=cache,
+                                    results_path=args.results, progress=progress)
@@ -0,0 +1,161 @@
+import os
+import random
+import argparse
+from collections import deque
+
+# Same order as DIRECTIONS in search_algorithms.search_utility
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+LAYOUTS = ("scatter", "rooms")
+MIN_ROOM = 3  # Rooms are not split any further once a side would drop below this
+
+# Builds a solvable weighted puzzle. Stones start on the goals and are pulled away at random by Ares;
+# every pull is a push played backwards, so replaying the pulls in reverse solves the puzzle.
+# The same arguments and seed always give the same puzzle. width/height include the outer wall.
+def generate_puzzle(width, height, stones, seed, layout="scatter", wall_density=0.15, pulls=None, max_weight=9, attempts=50):
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {LAYOUTS}.")
+    rng = random.Random(seed)
+    pulls = pulls if pulls is not None else stones * (width + height)
+
+    for _ in range(attempts):
+        floor = carve_floor(width, height, layout, wall_density, rng)
+        if len(floor) < stones * 3:
+            continue
+        goals = rng.sample(sorted(floor), stones)
+        placed = pull_stones(floor, goals, pulls, rng)
+        if placed is None:
+            continue
+        ares, stone_cells = placed
+        weights = [rng.randint(1, max_weight) for _ in range(stones)]
+        return weights, render(width, height, floor, set(goals), ares, stone_cells)
+    raise ValueError(f"Could not generate a {width}x{height} puzzle with {stones} stones; try fewer stones or fewer walls.")
+
+# Floor cells (row, col) of one connected area inside the outer wall
+def carve_floor(width, height, layout, wall_density, rng):
+    floor = {(i, j) for i in range(1, height - 1) for j in range(1, width - 1)}
+    if layout == "rooms":
+        divide(floor, 1, 1, height - 2, width - 2, rng)
+    else:
+        for cell in sorted(floor):
+            if rng.random() < wall_density:
+                floor.discard(cell)
+
+    # Keep only the largest connected part so every floor cell is reachable
+    best = set()
+    unvisited = set(floor)
+    while unvisited:
+        component = reachable(floor, min(unvisited), set())
+        unvisited -= component
+        if len(component) > len(best):
+            best = component
+    return best
+
+# Recursive division: split the room with a wall that has one doorway, then split both halves
+def divide(floor, top, left, rows, cols, rng):
+    horizontal = rows > cols if rows != cols else rng.random() < 0.5
+    if (rows if horizontal else cols) < 2 * MIN_ROOM + 1:
+        return
+    if horizontal:
+        wall = top + rng.randrange(MIN_ROOM, rows - MIN_ROOM)
+        door = left + rng.randrange(cols)
+        for j in range(left, left + cols):
+            if j != door:
+                floor.discard((wall, j))
+        divide(floor, top, left, wall - top, cols, rng)
+        divide(floor, wall + 1, left, top + rows - wall - 1, cols, rng)
+    else:
+        wall = left + rng.randrange(MIN_ROOM, cols - MIN_ROOM)
+        door = top + rng.randrange(rows)
+        for i in range(top, top + rows):
+            if i != door:
+                floor.discard((i, wall))
+        divide(floor, top, left, rows, wall - left, rng)
+        divide(floor, top, wall + 1, rows, left + cols - wall - 1, rng)
+
+# Cells Ares can walk to from start without going through a stone
+def reachable(floor, start, blocked):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in DIRECTIONS:
+            nxt = (x + dx, y + dy)
+            if nxt in floor and nxt not in blocked and nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return seen
+
+# Random walk of pulls starting from the solved position. Ares standing at a with a stone at a + d
+# can step back to a - d, dragging the stone onto a. Returns (Ares cell, stone cells), or None if
+# every stone is still on its goal at the end.
+def pull_stones(floor, goals, pulls, rng):
+    stone_cells = list(goals)
+    free = sorted(floor - set(stone_cells))
+    if not free:
+        return None
+    ares = rng.choice(free)
+
+    for _ in range(pulls):
+        occupied = set(stone_cells)
+        region = reachable(floor, ares, occupied)
+        options = []
+        for x, y in sorted(region):
+            for dx, dy in DIRECTIONS:
+                stone = (x + dx, y + dy)
+                back = (x - dx, y - dy)
+                if stone in occupied and back in floor and back not in occupied:
+                    options.append(((x, y), stone, back))
+        if not options:
+            break
+        stand, stone, back = rng.choice(options)
+        stone_cells[stone_cells.index(stone)] = stand
+        ares = back
+
+    if set(stone_cells) == set(goals):
+        return None
+    # Ares may start on any cell reachable from where the last pull left off
+    ares = rng.choice(sorted(reachable(floor, ares, set(stone_cells))))
+    return ares, stone_cells
+
+def render(width, height, floor, goals, ares, stone_cells):
+    grid = [["#"] * width for _ in range(height)]
+    for i, j in floor:
+        grid[i][j] = "." if (i, j) in goals else " "
+    for i, j in stone_cells:
+        grid[i][j] = "*" if (i, j) in goals else "$"
+    i, j = ares
+    grid[i][j] = "+" if (i, j) in goals else "@"
+    return grid
+
+# Same layout as the files in input/: the weights on the first line, then the grid
+def write_puzzle(path, weights, grid):
+    with open(path, 'w') as f:
+        f.write(" ".join(map(str, weights)) + "\n")
+        for row in grid:
+            f.write("".join(row) + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate solvable weighted puzzles as input-NN.txt files.")
+    parser.add_argument("--output", default="generated", help="folder the input-NN.txt files are written to")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--start", type=int, default=1, help="number of the first file")
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--height", type=int, default=10)
+    parser.add_argument("--stones", type=int, default=3)
+    parser.add_argument("--layout", choices=LAYOUTS, default="scatter")
+    parser.add_argument("--wall-density", type=float, default=0.15, help="share of inner cells turned into walls (scatter layout)")
+    parser.add_argument("--pulls", type=int, default=None, help="random pulls away from the goals (default: stones * (width + height))")
+    parser.add_argument("--max-weight", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first puzzle; the following ones use seed + 1, seed + 2, ...")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    for k in range(args.count):
+        weights, grid = generate_puzzle(args.width, args.height, args.stones, args.seed + k, args.layout,
+                                        args.wall_density, args.pulls, args.max_weight)
+        path = os.path.join(args.output, f"input-{args.start + k:02}.txt")
+        write_puzzle(path, weights, grid)
+        print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import json
+
+RESULTS_FILE = "results.jsonl"  # Written next to the <ALG>/ folders of a batch's output folder
+
+# Outcome of a job, one of these per record
+STATUS_SOLVED = "solved"
+STATUS_NO_SOLUTION = "no_solution"
+STATUS_BUDGET_EXCEEDED = "budget_exceeded"
+STATUS_ERROR = "error"
+
+# Flat, JSON-ready form of a result dict as process_input_file builds it.
+# Memory is in bytes, as measured; the text outputs show it in KB.
+def result_record(result):
+    final_state = result["final_state"]
+    exceeded = result.get("budget_exceeded")
+    record = {
+        "input_file": result["input_file"],
+        "algorithm": result["algorithm"],
+        "algorithm_key": result.get("algorithm_key"),
+        "status": None,
+        "steps": None,
+        "cost": None,
+        "path": None,
+        "nodes_generated": result["nodes_generated"],
+        "time_taken": result["time_taken"],
+        "memory_used": result["memory_used"],
+        "measure": result.get("measure"),
+        "pruned": result.get("pruned"),
+        "budget": None,
+        "cached": bool(result.get("cached")),
+        "error_message": result["error_message"],
+    }
+    if result["error_message"]:
+        record["status"] = STATUS_ERROR
+    elif exceeded:
+        record["status"] = STATUS_BUDGET_EXCEEDED
+        record["budget"] = {"limit": exceeded.limit, "frontier_size": exceeded.frontier_size, "visited_size": exceeded.visited_size}
+    elif isinstance(final_state, str):
+        record["status"] = STATUS_NO_SOLUTION
+    else:
+        record["status"] = STATUS_SOLVED
+        record["steps"] = len(final_state.path)
+        record["cost"] = final_state.cost
+        record["path"] = final_state.path
+    return record
+
+class JsonlSink:
+    # One JSON record per line, flushed as each job finishes, so a batch that dies half way
+    # still leaves every finished result readable
+    def __init__(self, path, mode='w'):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.file = open(path, mode)
+
+    def write(self, result):
+        self.file.write(json.dumps(result_record(result)) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_results(path):
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# Latest record for one map and algorithm (algorithm_key is the output folder name, e.g. "A_star"),
+# or None if the batch file does not exist or has no such job
+def find_result(path, input_file, algorithm_key):
+    if not os.path.exists(path):
+        return None
+    found = None
+    for record in read_results(path):
+        if record["input_file"] == input_file and record["algorithm_key"] == algorithm_key:
+            found = record
+    return found
@@ -0,0 +1,144 @@
+import itertools
+from .search_utility import *
+from .budget import BudgetExceeded
+from .engine import process_input_files
+from .measurement import Measurement, MEASURE_TRACEMALLOC
+from .board import Board
+from .assignment import AssignmentHeuristic
+from .A_star import CustomizeState, compact_heuristic
+
+# Anytime repairing A* (ARA*). The first round orders the open list by g + weight * h with an inflated weight,
+# which finds a plan quickly; every following round lowers the weight by weight_step and carries on from the
+# states already searched instead of starting over. States that got cheaper after being expanded in a round
+# (INCONS) are only reopened in the next one. The last round runs at weight 1 and proves the plan optimal.
+#
+# Yields (solution, bound, nodes_generated, time_taken) each time a cheaper plan is found: solution is a
+# CustomizeState holding the plan's path and cost, and bound is how far from optimal it can be at most
+# (cost <= bound * optimal). The generator's return value is the usual (final_state, nodes_generated,
+# time_taken, memory_used, pruned) tuple with the best plan found, which under a budget is the plan
+# reached by the deadline rather than BudgetExceeded, as long as there is one.
+def ara_star_solutions(weights, grid, deadlock_detection=False, normalize_player=False, initial_weight=3.0, weight_step=0.5,
+                       budget=None, measure=MEASURE_TRACEMALLOC, progress=None):
+    board = Board(weights, grid)
+    engine = AssignmentHeuristic(board)
+    initial_state = board.initial_state()
+    nodes_generated = 0
+    pruned = new_pruning_counters(deadlock_detection)
+    inf = float('inf')
+
+    measurement = Measurement(measure).start()
+    if budget:
+        budget.start()
+    if progress is not None:
+        progress.start()
+    try:
+        heuristics = {initial_state.zkey: compact_heuristic(initial_state, board, engine)}  # Zobrist hash -> h
+        states = {initial_state.zkey: initial_state}  # Zobrist hash -> cheapest CompactState reached
+        closed = set()  # Expanded in the current round
+        inconsistent = set()  # Expanded this round, then reached again more cheaply
+        sequence = itertools.count()
+        weight = max(1.0, initial_weight)
+        incumbent = None  # Cheapest goal CompactState so far
+        published = None
+        open_list = []
+        if heuristics[initial_state.zkey] < inf:
+            open_list.append((weight * heuristics[initial_state.zkey], heuristics[initial_state.zkey], next(sequence), initial_state))
+        if board.is_goal(board.unpack_cells(initial_state.key)[1]):
+            incumbent = initial_state
+
+        while True:
+            # Improve the path under the current weight until no open state can beat the incumbent
+            while open_list:
+                f_cost, _, _, current_state = open_list[0]
+                if incumbent is not None and f_cost >= incumbent.cost:
+                    break
+                heapq.heappop(open_list)
+                zkey = current_state.zkey
+                if states[zkey] is not current_state or zkey in closed:
+                    continue  # Superseded by a cheaper copy, or already expanded this round
+                nodes_generated += 1
+                if budget:
+                    limit = budget.exceeded(nodes_generated)
+                    if limit:
+                        time_taken, memory_used = measurement.stop()
+                        if incumbent is None:
+                            return BudgetExceeded(limit, len(open_list), len(states)), nodes_generated, time_taken, memory_used, pruned
+                        return solution_state(board, incumbent, normalize_player), nodes_generated, time_taken, memory_used, pruned
+                if progress is not None and nodes_generated >= progress.next_check:
+                    progress.report(nodes_generated, len(open_list), len(states), f_cost, current_state.cost)
+                closed.add(zkey)
+
+                ares_cell, stone_cells = board.unpack_cells(current_state.key)
+                if normalize_player:
+                    successors = get_push_successors(current_state, ares_cell, stone_cells, board, pruned, deadlock_detection)
+                else:
+                    successors = get_compact_successors(current_state, ares_cell, stone_cells, board, pruned, deadlock_detection)
+
+                for successor in successors:
+                    known = states.get(successor.zkey)
+                    if known is not None and known.cost <= successor.cost:
+                        continue
+                    h = heuristics.get(successor.zkey)
+                    if h is None:
+                        h = heuristics[successor.zkey] = compact_heuristic(successor, board, engine, current_state)
+                    if h == inf:
+                        continue  # Some stone can no longer be matched to a switch
+                    if incumbent is not None and successor.cost + h >= incumbent.cost:
+                        continue  # h never overestimates, so this cannot lead to a cheaper plan
+                    states[successor.zkey] = successor
+                    if h == 0:
+                        incumbent = successor  # Every stone on a switch; cheaper than the incumbent by the test above
+                    elif successor.zkey in closed:
+                        inconsistent.add(successor.zkey)
+                    else:
+                        heapq.heappush(open_list, (successor.cost + weight * h, h, next(sequence), successor))
+
+            if incumbent is None:
+                break  # Open list exhausted without reaching a goal: there is no solution
+
+            # Every state that could still lead to a cheaper plan, for the next round and for the bound
+            frontier = [state for _, _, _, state in open_list if states[state.zkey] is state and state.zkey not in closed]
+            frontier += [states[zkey] for zkey in inconsistent]
+            lower_bound = min([incumbent.cost] + [state.cost + heuristics[state.zkey] for state in frontier])
+            bound = min(weight, incumbent.cost / lower_bound) if lower_bound else 1.0
+            if incumbent is not published:
+                published = incumbent
+                yield solution_state(board, incumbent, normalize_player), bound, nodes_generated, measurement.elapsed()
+            if bound <= 1.0:
+                break
+
+            # Next round: lower the weight, reopen INCONS and reorder everything still open
+            weight = max(1.0, weight - weight_step)
+            open_list = [(state.cost + weight * heuristics[state.zkey], heuristics[state.zkey], next(sequence), state)
+                         for state in frontier if state.cost + heuristics[state.zkey] < incumbent.cost]
+            heapq.heapify(open_list)
+            closed = set()
+            inconsistent = set()
+
+        time_taken, memory_used = measurement.stop()
+        final_state = solution_state(board, incumbent, normalize_player) if incumbent is not None else None
+        return final_state, nodes_generated, time_taken, memory_used, pruned
+    finally:
+        measurement.stop()  # Also when the caller stopped iterating early or the search raised
+
+# The plan behind a goal CompactState, as the CustomizeState A* works with (h is 0 on a goal)
+def solution_state(board, goal_state, normalize_player):
+    state = board.decompress(goal_state, normalize_player)
+    solution = CustomizeState(state.ares_pos, state.stones, state.cost, state.path)
+    solution.setHeuristic(0)
+    return solution
+
+# Runs ara_star_solutions to the end (or to the budget) and returns its final tuple, for callers that
+# only want the best plan
+def ara_star(weights, grid, deadlock_detection=False, normalize_player=False, initial_weight=3.0, weight_step=0.5,
+             budget=None, measure=MEASURE_TRACEMALLOC, progress=None):
+    solutions = ara_star_solutions(weights, grid, deadlock_detection, normalize_player, initial_weight, weight_step, budget, measure, progress)
+    while True:
+        try:
+            next(solutions)
+        except StopIteration as finished:
+            return finished.value
+
+def ARA_star_process_input_files(input_folder: str, deadlock_detection=False, normalize_player=False, budget=None, measure=MEASURE_TRACEMALLOC,
+                                 progress=None) -> Iterator[Dict[str, Any]]:
+    yield from process_input_files(ara_star, "ARA Star Search", input_folder, deadlock_detection, normalize_player, budget, measure, progress)
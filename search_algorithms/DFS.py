@@ -1,102 +1,116 @@
 from typing import final
 from .search_utility import *
+from .budget import BudgetExceeded
+from .engine import process_input_files
+from .measurement import Measurement, MEASURE_TRACEMALLOC
+from .board import Board
 
-OVER_RECURSION = -1
-def DFS_Search(weights, grid) -> object:
-    initial_state = find_initial_state(grid)
-    visited = set()
-    nodes_generated = 0
-    start_time = time.time()
-    tracemalloc.start()
-    search = recursive_dfs(initial_state, grid, weights, tracemalloc, visited, start_time, nodes_generated)
-    if search:
-        return search
-    else:
-        print("No solution found.")
-        return None, nodes_generated, time.time() - start_time, tracemalloc.get_traced_memory()[1]
-
-def recursive_dfs(current_state, grid, weights, tracemalloc, visited, start_time, nodes_generated):
-    # Check if the current state is the goal state
-    if goal_state(current_state, grid): #early check
-        time_taken = time.time() - start_time
-        memory_used = tracemalloc.get_traced_memory()[1]
-        return current_state, nodes_generated, time_taken, memory_used
-
-    # Increment nodes generated and create a unique key for the current state
-    nodes_generated += 1
-    state_key = (current_state.ares_pos, tuple(current_state.stones))
+def DFS_Search(weights, grid, deadlock_detection=False, normalize_player=False, verify_hashes=False, budget=None, depth_limit=None, measure=MEASURE_TRACEMALLOC,
+               progress=None) -> object:
+    board = Board(weights, grid)
+    hash_verifier = HashVerifier() if verify_hashes else None
+    pruned = new_pruning_counters(deadlock_detection)
+    measurement = Measurement(measure).start()
+    try:
+        if budget:
+            budget.start()
+        if progress is not None:
+            progress.start()
+        outcome, nodes_generated, _ = depth_first(board, depth_limit, 0, pruned, deadlock_detection, normalize_player, hash_verifier, budget, progress)
+        return dfs_result(board, outcome, nodes_generated, measurement, pruned, normalize_player)
+    finally:
+        measurement.stop()  # Already stopped unless the search raised; ends tracing either way
 
-    # Skip states we've already visited
-    if state_key in visited:
-        return None
-    visited.add(state_key)
+# Depth-limited DFS with limits 0, 1, 2, ... (in moves, or in pushes when normalize_player is set) until a
+# solution turns up, nothing was cut off by the limit any more, or max_depth is reached. Finds a solution
+# with the fewest steps while keeping DFS's memory; nodes_generated adds up over all iterations.
+def iterative_deepening_dfs(weights, grid, deadlock_detection=False, normalize_player=False, verify_hashes=False, budget=None, max_depth=None, measure=MEASURE_TRACEMALLOC,
+                           progress=None) -> object:
+    board = Board(weights, grid)
+    hash_verifier = HashVerifier() if verify_hashes else None
+    pruned = new_pruning_counters(deadlock_detection)
+    measurement = Measurement(measure).start()
+    try:
+        if budget:
+            budget.start()
+        if progress is not None:
+            progress.start()
+        depth_limit = 0
+        nodes_generated = 0
+        while True:
+            outcome, nodes_generated, cut_off = depth_first(board, depth_limit, nodes_generated, pruned, deadlock_detection, normalize_player, hash_verifier, budget,
+                                                            progress)
+            if outcome is not None or not cut_off or (max_depth is not None and depth_limit >= max_depth):
+                break
+            depth_limit += 1
+        return dfs_result(board, outcome, nodes_generated, measurement, pruned, normalize_player)
+    finally:
+        measurement.stop()  # Already stopped unless the search raised; ends tracing either way
 
-    # Explore successors
-    for successor in get_successors(current_state, weights, grid):
-        try:
-            result = recursive_dfs(successor, grid, weights, tracemalloc, visited, start_time, nodes_generated)
-        except RecursionError:
-            time_taken = time.time() - start_time
-            memory_used = tracemalloc.get_traced_memory()[1]
-            return OVER_RECURSION, nodes_generated, time_taken, memory_used
+# One depth-first pass over an explicit stack. Each frame is an iterator over one expanded node's successors,
+# so the stack holds the current path plus its pending siblings and no Python recursion is involved.
+# Returns (outcome, nodes_generated, cut_off): outcome is the goal CompactState, a BudgetExceeded or None,
+# and cut_off tells whether depth_limit kept any node from being expanded.
+def depth_first(board, depth_limit, nodes_generated, pruned, deadlock_detection, normalize_player, hash_verifier, budget, progress=None):
+    visited = {}  # Zobrist hash (normalized to Ares's region if asked) -> depth it was expanded at
+    stack = [iter([board.initial_state()])]
+    cut_off = False
 
-        if result:
-            return result  # Propagate the solution up if found
+    while stack:
+        current_state = next(stack[-1], None)
+        if current_state is None:
+            stack.pop()  # Every successor of this frame's node has been explored
+            continue
+        nodes_generated += 1
+        if budget:
+            limit = budget.exceeded(nodes_generated)
+            if limit:
+                return BudgetExceeded(limit, len(stack), len(visited)), nodes_generated, cut_off
+        if progress is not None and nodes_generated >= progress.next_check:
+            progress.report(nodes_generated, len(stack), len(visited), g=current_state.cost)
 
-    # Return None if no solution is found along this path
-    return None
+        ares_cell, stone_cells = board.unpack_cells(current_state.key)
+        if board.is_goal(stone_cells):
+            return current_state, nodes_generated, cut_off
 
-def DFS_process_input_files(input_folder: str) -> List[Dict[str, Any]]:
-    output_data = []
+        depth = len(stack) - 1  # The initial state comes out of frame 0
+        if normalize_player:
+            region = board.walk_distances(ares_cell, set(stone_cells))
+            state_key, exact_key = board.normalized_key(current_state, ares_cell, region)
+        else:
+            state_key, exact_key = current_state.zkey, current_state.key
 
-    # Process each input file in the folder
-    for input_file in os.listdir(input_folder):
-        input_path = os.path.join(input_folder, input_file)
-        
-        if os.path.isfile(input_path) and input_file.endswith(".txt"):
-            result = {
-                "input_file": input_file,
-                "algorithm": "Depth-First Search",
-                "final_state": None,
-                "nodes_generated": None,
-                "time_taken": None,
-                "memory_used": None,
-                "error_message": None
-            }
+        # Skip states we've already expanded. Under a depth limit a state reached again at a smaller
+        # depth is expanded again, since the first visit may have been cut off before finding the goal.
+        seen_depth = visited.get(state_key)
+        if hash_verifier and seen_depth is not None:
+            hash_verifier.check(state_key, exact_key)
+        if seen_depth is not None and (depth_limit is None or seen_depth <= depth):
+            continue
+        if depth_limit is not None and depth >= depth_limit:
+            cut_off = True
+            continue
+        if hash_verifier:
+            hash_verifier.check(state_key, exact_key)
+        visited[state_key] = depth
 
-            try:
-                # Parse input data
-                weights, grid, error_message = parse_input(input_path)
-                if error_message:
-                    # If parsing error, save the error message in the result and skip the search
-                    result["error_message"] = error_message
-                    output_data.append(result)
-                    continue
-                
-                # Run DFS on the parsed data
-                final_state, nodes_generated, time_taken, memory_used = DFS_Search(weights, grid)
-                
-                # Store results
-                result["final_state"] = final_state
-                result["nodes_generated"] = nodes_generated
-                result["time_taken"] = time_taken
-                result["memory_used"] = memory_used
-                
-                # If no solution was found, mark it in the final_state
-                if final_state == OVER_RECURSION:
-                    result["final_state"] = "The searching got over the limit of recursion"
-                elif not final_state:
-                    result["final_state"] = "No solution found"
+        if normalize_player:
+            successors = get_push_successors(current_state, ares_cell, stone_cells, board, pruned, deadlock_detection, region)
+        else:
+            successors = get_compact_successors(current_state, ares_cell, stone_cells, board, pruned, deadlock_detection)
+        stack.append(iter(successors))
 
+    return None, nodes_generated, cut_off
 
-            except FileNotFoundError:
-                result["error_message"] = f"File not found: {input_path}"
-            except IOError as e:
-                result["error_message"] = f"I/O error with file {input_path}: {e}"
-            except Exception as e:
-                result["error_message"] = f"An unexpected error occurred while processing {input_file}: {e}"
-
-            # Append the result to the output data list
-            output_data.append(result)
+def dfs_result(board, outcome, nodes_generated, measurement, pruned, normalize_player):
+    time_taken, memory_used = measurement.stop()
+    if outcome is None:
+        print("No solution found.")
+        return None, nodes_generated, time_taken, memory_used, pruned
+    if isinstance(outcome, BudgetExceeded):
+        return outcome, nodes_generated, time_taken, memory_used, pruned
+    return board.decompress(outcome, normalize_player), nodes_generated, time_taken, memory_used, pruned
 
-    return output_data
\ No newline at end of file
+def DFS_process_input_files(input_folder: str, deadlock_detection=False, normalize_player=False, budget=None, measure=MEASURE_TRACEMALLOC,
+                            progress=None) -> Iterator[Dict[str, Any]]:
+    yield from process_input_files(DFS_Search, "Depth-First Search", input_folder, deadlock_detection, normalize_player, budget, measure, progress)
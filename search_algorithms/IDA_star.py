@@ -0,0 +1,118 @@
+from .search_utility import *
+from .budget import budget_result
+from .engine import process_input_files
+from .measurement import Measurement, MEASURE_TRACEMALLOC
+from .board import Board
+from .assignment import AssignmentHeuristic
+from .A_star import compact_heuristic
+
+REPLACEMENT_POLICIES = ("always", "depth", "never")
+
+class TranspositionTable:
+    # Fixed-size table of (Zobrist hash, cost reached, iteration), one entry per slot zkey % size.
+    # A state reached again in the same iteration at no lower cost can be skipped. Memory is
+    # allocated up front, so it stays the same however long the search runs.
+    #   always: a new entry overwrites whatever sits in its slot
+    #   depth:  only overwrite stale entries or ones reached at a higher cost (deeper)
+    #   never:  keep the first entry of the iteration in each slot
+    def __init__(self, size, policy="depth"):
+        if policy not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy {policy!r}, expected one of {REPLACEMENT_POLICIES}.")
+        self.size = size
+        self.policy = policy
+        self.zkeys = [0] * size
+        self.costs = [0] * size
+        self.iterations = [0] * size  # 0 marks an empty slot; iterations are numbered from 1
+        self.hits = 0
+
+    def seen(self, zkey, cost, iteration):
+        slot = zkey % self.size
+        if self.iterations[slot] == iteration and self.zkeys[slot] == zkey and self.costs[slot] <= cost:
+            self.hits += 1
+            return True
+        return False
+
+    def store(self, zkey, cost, iteration):
+        slot = zkey % self.size
+        if self.iterations[slot] == iteration and self.zkeys[slot] != zkey:
+            if self.policy == "never" or (self.policy == "depth" and self.costs[slot] <= cost):
+                return
+        self.zkeys[slot] = zkey
+        self.costs[slot] = cost
+        self.iterations[slot] = iteration
+
+def ida_star(weights, grid, deadlock_detection=False, normalize_player=False, table_size=1 << 16, replacement="depth",
+             heuristic_cache_size=20000, budget=None, measure=MEASURE_TRACEMALLOC, progress=None):
+    board = Board(weights, grid)
+    engine = AssignmentHeuristic(board, cache_size=heuristic_cache_size)
+    initial_state = board.initial_state()
+    threshold = compact_heuristic(initial_state, board, engine)
+    nodes_generated = 0
+    pruned = new_pruning_counters(deadlock_detection)
+    iteration = 0
+
+    measurement = Measurement(measure).start()
+    try:
+        if budget:
+            budget.start()
+        if progress is not None:
+            progress.start()
+        # Allocated after measurement starts so the table's fixed footprint shows up in the memory used
+        table = TranspositionTable(table_size, replacement) if table_size else None
+
+        # Each iteration is a depth-first search bounded by f = g + h <= threshold; the next threshold is
+        # the smallest f that went over. Only the current path and its pending siblings are kept.
+        while threshold < float('inf'):
+            iteration += 1
+            next_threshold = float('inf')
+            stack = [iter([initial_state])]
+
+            while stack:
+                current_state = next(stack[-1], None)
+                if current_state is None:
+                    stack.pop()
+                    continue
+                nodes_generated += 1
+                if budget:
+                    limit = budget.exceeded(nodes_generated)
+                    if limit:
+                        return budget_result(limit, nodes_generated, measurement, pruned, len(stack))
+                if progress is not None and nodes_generated >= progress.next_check:
+                    progress.report(nodes_generated, len(stack), f=threshold, g=current_state.cost)
+
+                f_cost = current_state.cost + compact_heuristic(current_state, board, engine, current_state.parent)
+                if f_cost > threshold:
+                    next_threshold = min(next_threshold, f_cost)
+                    continue
+
+                ares_cell, stone_cells = board.unpack_cells(current_state.key)
+                if board.is_goal(stone_cells):
+                    time_taken, memory_used = measurement.stop()
+                    return board.decompress(current_state, normalize_player), nodes_generated, time_taken, memory_used, pruned
+
+                if table:
+                    if table.seen(current_state.zkey, current_state.cost, iteration):
+                        continue
+                    table.store(current_state.zkey, current_state.cost, iteration)
+
+                if normalize_player:
+                    successors = get_push_successors(current_state, ares_cell, stone_cells, board, pruned, deadlock_detection)
+                else:
+                    successors = get_compact_successors(current_state, ares_cell, stone_cells, board, pruned, deadlock_detection)
+
+                # Never step straight back to the parent's state
+                parent = current_state.parent
+                if parent is not None:
+                    successors = [successor for successor in successors if successor.zkey != parent.zkey]
+                stack.append(iter(successors))
+
+            threshold = next_threshold
+
+        time_taken, memory_used = measurement.stop()
+        return None, nodes_generated, time_taken, memory_used, pruned
+    finally:
+        measurement.stop()  # Already stopped unless the search raised; ends tracing either way
+
+def IDA_star_process_input_files(input_folder: str, deadlock_detection=False, normalize_player=False, budget=None, measure=MEASURE_TRACEMALLOC,
+                                 progress=None) -> Iterator[Dict[str, Any]]:
+    yield from process_input_files(ida_star, "IDA Star Search", input_folder, deadlock_detection, normalize_player, budget, measure, progress)
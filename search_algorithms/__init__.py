@@ -1,4 +1,6 @@
 from .A_star import *
+from .ARA_star import *
 from .BFS import *
 from .DFS import *
+from .IDA_star import *
 from .UCS import *
\ No newline at end of file
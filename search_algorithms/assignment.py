@@ -0,0 +1,127 @@
+from collections import OrderedDict
+
+# Minimum-cost perfect matching of rows (stones) to columns (switches), Hungarian method with
+# potentials. Arrays are 1-indexed, column 0 is the usual dummy: p[j] is the row assigned to column j,
+# u/v are the row/column potentials. Keeping p, u and v lets a later call re-add a single row.
+def hungarian(cost_matrix):
+    n = len(cost_matrix)
+    u = [0] * (n + 1)
+    v = [0] * (n + 1)
+    p = [0] * (n + 1)
+    for row in range(1, n + 1):
+        add_row(cost_matrix, row, u, v, p)
+    return p, u, v
+
+# Assign one free row on top of an optimal partial assignment (shortest augmenting path).
+# The potentials of the other rows stay feasible, so the result is optimal again.
+def add_row(cost_matrix, row, u, v, p):
+    n = len(cost_matrix)
+    minv = [float('inf')] * (n + 1)
+    used = [False] * (n + 1)
+    way = [0] * (n + 1)
+    p[0] = row
+    j0 = 0
+    while True:
+        used[j0] = True
+        i0 = p[j0]
+        costs = cost_matrix[i0 - 1]
+        u_i0 = u[i0]
+        delta = float('inf')
+        j1 = 0
+        for j in range(1, n + 1):
+            if not used[j]:
+                current = costs[j - 1] - u_i0 - v[j]
+                if current < minv[j]:
+                    minv[j] = current
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+        for j in range(n + 1):
+            if used[j]:
+                u[p[j]] += delta
+                v[j] -= delta
+            else:
+                minv[j] -= delta
+        j0 = j1
+        if p[j0] == 0:
+            break
+    # Flip the augmenting path
+    while j0:
+        j1 = way[j0]
+        p[j0] = p[j1]
+        j0 = j1
+
+class AssignmentHeuristic:
+    # Weighted stone-to-switch assignment bound, memoized by stone layout in a bounded LRU.
+    # A push moves exactly one stone, so a child's assignment is repaired from its parent's entry
+    # by re-adding that stone's row; a full solve only happens when the parent is not cached.
+    def __init__(self, board, cache_size=100000, incremental=True):
+        if board.stone_count != len(board.goal_positions):
+            raise ValueError("The number of stones does not match the number of switches.")
+        self.board = board
+        # Cost-matrix entry for a stone that can never be pushed onto that switch. It is larger than any
+        # assignment made only of real push costs, so the optimal value reaches it exactly when every
+        # assignment has to use such a pair; the value is then reported as inf.
+        longest = max((distance for distances in board.push_distances for distance in distances), default=0)
+        self.unreachable = max(longest, 0) * sum(board.weights) + 1
+        self.cache_size = cache_size
+        self.incremental = incremental
+        self.cache = OrderedDict()  # Stone layout -> (value, cost_matrix, p, u, v)
+        self.full_solves = 0
+        self.repairs = 0
+        self.hits = 0
+
+    def value(self, key, stone_cells, parent_key=None):
+        cell_bits = self.board.cell_bits
+        layout = key >> cell_bits  # Ares lives in the lowest field, the rest is the stone layout
+        entry = self.cache.get(layout)
+        if entry is not None:
+            self.cache.move_to_end(layout)
+            self.hits += 1
+            return entry[0]
+
+        if self.incremental and parent_key is not None:
+            parent_layout = parent_key >> cell_bits
+            parent_entry = self.cache.get(parent_layout)
+            if parent_entry is not None:
+                moved = ((layout ^ parent_layout).bit_length() - 1) // cell_bits
+                entry = self._repair(parent_entry, moved, stone_cells[moved])
+                self.repairs += 1
+        if entry is None:
+            entry = self._solve(stone_cells)
+            self.full_solves += 1
+
+        if self.cache_size > 0:
+            self.cache[layout] = entry
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return entry[0]
+
+    def cost_row(self, i, cell):
+        weight = self.board.weights[i]
+        row = []
+        for distances in self.board.push_distances:
+            distance = distances[cell]
+            row.append(distance * weight if distance >= 0 else self.unreachable)
+        return row
+
+    def _solve(self, stone_cells):
+        cost_matrix = [self.cost_row(i, cell) for i, cell in enumerate(stone_cells)]
+        p, u, v = hungarian(cost_matrix)
+        return self._entry(cost_matrix, p, u, v)
+
+    def _repair(self, parent_entry, moved, cell):
+        _, parent_matrix, p, u, v = parent_entry
+        cost_matrix = parent_matrix[:]  # Unchanged rows are shared with the parent
+        cost_matrix[moved] = self.cost_row(moved, cell)
+        p, u, v = p[:], u[:], v[:]
+        p[p.index(moved + 1, 1)] = 0  # Free the moved stone's switch, then re-add its row
+        add_row(cost_matrix, moved + 1, u, v, p)
+        return self._entry(cost_matrix, p, u, v)
+
+    def _entry(self, cost_matrix, p, u, v):
+        value = sum(cost_matrix[p[j] - 1][j - 1] for j in range(1, len(p)))
+        if value >= self.unreachable:
+            value = float('inf')  # No assignment gets every stone onto a switch: dead state
+        return value, cost_matrix, p, u, v
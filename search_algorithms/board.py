@@ -0,0 +1,224 @@
+import random
+from collections import deque
+from functools import cached_property, lru_cache
+from .search_utility import *
+from .assignment import AssignmentHeuristic
+
+GOAL_CELLS = {'.', '+', '*'}
+ZOBRIST_SEED = 420  # Fixed so hashes (and any collision) reproduce from run to run
+
+class Board(StateCodec):
+    # Static part of a puzzle, parsed once and shared by successor generation, goal tests and heuristics.
+    # Cells are flat indexes (row * width + col), the same ones StateCodec packs into state keys.
+    def __init__(self, weights, grid):
+        super().__init__(grid)
+        self.weights = weights
+        self.grid = grid
+        self.height = len(grid)
+        self.cell_count = self.height * self.width
+
+        # Flat wall/floor bitmap; cells past the end of a short row count as walls
+        self.floor = bytearray(self.cell_count)
+        goal_cells = []
+        for i, row in enumerate(grid):
+            for j, cell in enumerate(row):
+                if cell != '#':
+                    self.floor[i * self.width + j] = 1
+                if cell in GOAL_CELLS:
+                    goal_cells.append(i * self.width + j)
+        self.goal_cells = frozenset(goal_cells)
+        self.goal_positions = [self.position(cell) for cell in goal_cells]  # Switches in grid scan order
+
+        # neighbours[cell * 4 + code] is the cell reached by DIRECTIONS[code], or -1 for a wall
+        self.neighbours = [-1] * (self.cell_count * 4)
+        for cell in range(self.cell_count):
+            if not self.floor[cell]:
+                continue
+            x, y = self.position(cell)
+            for code, (dx, dy) in enumerate(DIRECTIONS):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.height and 0 <= ny < self.width and self.floor[nx * self.width + ny]:
+                    self.neighbours[cell * 4 + code] = nx * self.width + ny
+
+        # Cells from which a lone stone can still be pushed onto some goal; pushes anywhere else are dead
+        self.live = bytearray(distance >= 0 for distance in self.pull_distances(self.goal_cells))
+
+        # Bit offset of each stone's field inside a packed key
+        self.stone_shifts = [self.cell_bits * (i + 1) for i in range(self.stone_count)]
+
+        # Zobrist tables: one random 64-bit word per (cell, player) and per (cell, stone index).
+        # A state's hash is the XOR of its words, so a move or push updates it in O(1).
+        rng = random.Random(ZOBRIST_SEED)
+        self.zobrist_player = [rng.getrandbits(64) for _ in range(self.cell_count)]
+        self.zobrist_stones = [[rng.getrandbits(64) for _ in range(self.cell_count)] for _ in range(self.stone_count)]
+
+        initial_state = find_initial_state(grid)
+        self.initial_key = self.pack(initial_state.ares_pos, initial_state.stones)
+        self.initial_zkey = self.zobrist_hash(self.initial_key)
+
+    # push_distances[j][cell]: minimum pushes from cell onto the j-th goal (goal_positions order), -1 if never.
+    # Built on first use and then kept for the lifetime of the board, i.e. once per puzzle.
+    @cached_property
+    def push_distances(self):
+        return [self.pull_distances([self.cell(goal)]) for goal in self.goal_positions]
+
+    # Shared assignment-heuristic engine for callers that do not bring their own (see heuristic_function)
+    @cached_property
+    def assignment_heuristic(self):
+        return AssignmentHeuristic(self)
+
+    def zobrist_hash(self, key):
+        ares_cell, stone_cells = self.unpack_cells(key)
+        zkey = self.zobrist_player[ares_cell]
+        for i, cell in enumerate(stone_cells):
+            zkey ^= self.zobrist_stones[i][cell]
+        return zkey
+
+    def initial_state(self) -> CompactState:
+        return CompactState(self.initial_key, 0, zkey=self.initial_zkey)
+
+    def is_goal(self, stone_cells):
+        return self.goal_cells.issuperset(stone_cells)
+
+    # In push-only mode the walking between pushes is not stored, so it is re-expanded here
+    def decompress(self, compact_state, push_only=False) -> State:
+        if not push_only:
+            return super().decompress(compact_state)
+        ares_pos, stones = self.unpack(compact_state.key)
+        return State(ares_pos, stones, compact_state.cost, self.expand_push_path(compact_state))
+
+    # Walking distance from start to every cell Ares can reach without moving a stone (BFS order)
+    def walk_distances(self, start, blocked):
+        neighbours = self.neighbours
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for code in range(4):
+                nxt = neighbours[cell * 4 + code]
+                if nxt >= 0 and nxt not in distances and nxt not in blocked:
+                    distances[nxt] = distances[cell] + 1
+                    queue.append(nxt)
+        return distances
+
+    # Shortest u/d/l/r walk from start to goal around the blocked cells
+    def walk_path(self, start, goal, blocked):
+        neighbours = self.neighbours
+        came_from = {start: None}
+        queue = deque([start])
+        while queue and goal not in came_from:
+            cell = queue.popleft()
+            for code in range(4):
+                nxt = neighbours[cell * 4 + code]
+                if nxt >= 0 and nxt not in came_from and nxt not in blocked:
+                    came_from[nxt] = (cell, code)
+                    queue.append(nxt)
+        moves = []
+        cell = goal
+        while came_from[cell] is not None:
+            cell, code = came_from[cell]
+            moves.append(ACTIONS[code])
+        return "".join(reversed(moves))
+
+    # Key of the whole equivalence class: same stones, Ares anywhere in the same reachable region.
+    # Returns the Zobrist hash used for visited sets along with the exact packed key it stands for.
+    def normalized_key(self, state, ares_cell, region):
+        canonical = min(region)
+        return state.zkey ^ self.zobrist_player[ares_cell] ^ self.zobrist_player[canonical], state.key ^ ares_cell ^ canonical
+
+    # Every push-only node stores the pushing Ares position (the cell the stone left), so the walk
+    # before each push is the shortest path from the parent's Ares cell to the cell behind the stone
+    def expand_push_path(self, compact_state):
+        chain = []
+        while compact_state.parent is not None:
+            chain.append(compact_state)
+            compact_state = compact_state.parent
+
+        path = []
+        for node in reversed(chain):
+            ares_cell, stone_cells = self.unpack_cells(node.parent.key)
+            target = node.key & self.cell_mask
+            stand = self.neighbours[target * 4 + ((node.action - 4) ^ 1)]
+            path.append(self.walk_path(ares_cell, stand, set(stone_cells)))
+            path.append(ACTIONS[node.action])
+        return "".join(path)
+
+    # Minimum number of pushes that bring a lone stone from every cell onto one of sources (-1 if it never can).
+    # Runs backwards from sources: a stone pushed onto cell along code came from the previous cell,
+    # with Ares standing one cell further back, so both of those must be floor.
+    def pull_distances(self, sources):
+        neighbours = self.neighbours
+        distances = [-1] * self.cell_count
+        queue = deque(sources)
+        for cell in sources:
+            distances[cell] = 0
+
+        while queue:
+            cell = queue.popleft()
+            for code in range(4):
+                previous = neighbours[cell * 4 + (code ^ 1)]  # code ^ 1 is the opposite direction
+                if previous < 0 or distances[previous] >= 0:
+                    continue
+                if neighbours[previous * 4 + (code ^ 1)] >= 0:
+                    distances[previous] = distances[cell] + 1
+                    queue.append(previous)
+
+        return distances
+
+    # A 2x2 square around the freshly pushed stone that is all walls/stones can never be broken up again,
+    # so it is a deadlock as soon as one of its stones is off goal. occupied maps stone cell -> index.
+    def is_block_deadlock(self, cell, occupied):
+        neighbours = self.neighbours
+        for horizontal in (2, 3):
+            for vertical in (0, 1):
+                side = neighbours[cell * 4 + horizontal]
+                other_side = neighbours[cell * 4 + vertical]
+                if side >= 0:
+                    diagonal = neighbours[side * 4 + vertical]
+                elif other_side >= 0:
+                    diagonal = neighbours[other_side * 4 + horizontal]
+                else:
+                    diagonal = -1
+                square = (cell, side, other_side, diagonal)
+                if all(c < 0 or c in occupied for c in square) and \
+                        any(c in occupied and c not in self.goal_cells for c in square):
+                    return True
+        return False
+
+    # Freeze deadlock: the pushed stone can no longer move along either axis, and it (or a stone
+    # freezing it) is off goal. Stones already on the current check chain are treated as walls.
+    def is_freeze_deadlock(self, cell, occupied):
+        frozen = []
+        if not self._is_frozen(cell, occupied, set(), frozen):
+            return False
+        return any(stone not in self.goal_cells for stone in frozen)
+
+    def _is_frozen(self, cell, occupied, walls, frozen):
+        walls.add(cell)
+        result = self._is_blocked(cell, 0, occupied, walls, frozen) and self._is_blocked(cell, 2, occupied, walls, frozen)
+        walls.discard(cell)
+        if result:
+            frozen.append(cell)
+        return result
+
+    # code 0 checks the vertical axis (up/down), code 2 the horizontal one (left/right)
+    def _is_blocked(self, cell, code, occupied, walls, frozen):
+        first = self.neighbours[cell * 4 + code]
+        second = self.neighbours[cell * 4 + code + 1]
+        if first < 0 or second < 0 or first in walls or second in walls:
+            return True
+        if not self.live[first] and not self.live[second]:
+            return True
+        for side in (first, second):
+            if side in occupied and self._is_frozen(side, occupied, walls, frozen):
+                return True
+        return False
+
+# Boards for callers that only have (weights, grid), e.g. heuristic_function without a board,
+# so the per-map tables are not rebuilt for every node
+def board_for(weights, grid) -> Board:
+    return _cached_board(tuple(weights), tuple(tuple(row) for row in grid))
+
+@lru_cache(maxsize=16)
+def _cached_board(weights, grid):
+    return Board(list(weights), [list(row) for row in grid])
@@ -0,0 +1,54 @@
+import time
+from .measurement import current_rss
+
+# Names of the limits, as reported in BudgetExceeded.limit and in the output files
+TIME_BUDGET = "time"
+NODE_BUDGET = "nodes"
+MEMORY_BUDGET = "memory"
+
+class SearchBudget:
+    # Per-job limits checked from inside the search loops; None means no limit on that resource.
+    # The node limit is exact. Time and RSS are sampled every check_interval nodes, since reading
+    # the clock and /proc on every node would cost more than the nodes themselves.
+    def __init__(self, max_time=None, max_nodes=None, max_rss=None, check_interval=1024):
+        self.max_time = max_time  # Seconds of wall-clock time
+        self.max_nodes = max_nodes  # Generated nodes
+        self.max_rss = max_rss  # Bytes of resident memory
+        self.check_interval = check_interval
+        self.start()
+
+    # Called by each search when it starts, so one budget can be reused across jobs
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.next_check = self.check_interval
+
+    # Name of the first limit that has been passed, or None while the search may go on
+    def exceeded(self, nodes_generated):
+        if self.max_nodes is not None and nodes_generated > self.max_nodes:
+            return NODE_BUDGET
+        if nodes_generated < self.next_check:
+            return None
+        self.next_check = nodes_generated + self.check_interval
+        if self.max_time is not None and time.perf_counter() - self.start_time > self.max_time:
+            return TIME_BUDGET
+        if self.max_rss is not None:
+            rss = current_rss()
+            if rss is not None and rss > self.max_rss:
+                return MEMORY_BUDGET
+        return None
+
+class BudgetExceeded:
+    # Returned in place of the final state when a search is cut off by its budget,
+    # together with what the search still held at that point
+    def __init__(self, limit, frontier_size=None, visited_size=None):
+        self.limit = limit
+        self.frontier_size = frontier_size
+        self.visited_size = visited_size
+
+    def __str__(self):
+        return f"Budget Exceeded: {self.limit}"
+
+# Same tuple as a finished search, with BudgetExceeded as the final state and the partial statistics
+def budget_result(limit, nodes_generated, measurement, pruned, frontier_size=None, visited_size=None):
+    time_taken, memory_used = measurement.stop()
+    return BudgetExceeded(limit, frontier_size, visited_size), nodes_generated, time_taken, memory_used, pruned
@@ -0,0 +1,264 @@
+import itertools
+from collections import deque
+from .search_utility import *
+from .budget import BudgetExceeded, budget_result
+from .measurement import Measurement, MEASURE_TRACEMALLOC
+
+# Frontier types
+FIFO = "fifo"  # Oldest first: breadth-first
+LIFO = "lifo"  # Newest first: depth-first
+HEAP = "heap"  # Lowest priority first, any comparable priority
+BUCKET = "bucket"  # Lowest priority first, ties to the lowest h; int priorities no lower than state.cost only
+
+# Duplicate-detection policies
+DUPLICATES_NONE = "none"  # Tree search: states are expanded every time they come out of the frontier
+DUPLICATES_CLOSED = "closed"  # Each state is expanded once; successors already expanded are not queued
+DUPLICATES_BEST = "best"  # As closed, and a successor is only queued if it beats every queued copy of itself
+
+class FifoFrontier:
+    def __init__(self):
+        self.queue = deque()
+
+    def push(self, priority, state):
+        self.queue.append(state)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def __len__(self):
+        return len(self.queue)
+
+class LifoFrontier:
+    def __init__(self):
+        self.stack = []
+
+    def push(self, priority, state):
+        self.stack.append(state)
+
+    def pop(self):
+        return self.stack.pop()
+
+    def __len__(self):
+        return len(self.stack)
+
+class HeapFrontier:
+    # Equal priorities come out first in, first out. The sequence number also keeps heapq from ever
+    # comparing two states, which would go through the much slower CompactState.__lt__.
+    def __init__(self):
+        self.heap = []
+        self.sequence = itertools.count()
+
+    def push(self, priority, state):
+        heapq.heappush(self.heap, (priority, next(self.sequence), state))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+class BucketFrontier:
+    # Bucket queue for integer priorities f = g + h (g being state.cost): pushing into a bucket that already
+    # exists is a dict lookup and an append, with no comparisons. Each f bucket is split again by h = f - g so
+    # that ties go to the lowest h, i.e. the node closest to the goal; equal (f, h) pairs come out newest first.
+    # Buckets are sparse: only the f and h values actually queued get a stack, and a small heap over those
+    # values finds the lowest one, so memory grows with the number of distinct (f, h) pairs rather than with
+    # the size of the costs. A push below the lowest bucket (an inconsistent heuristic) is handled the same way.
+    def __init__(self):
+        self.buckets = {}  # f -> ({h: stack}, heap of those h)
+        self.f_values = []  # Heap of the f that have a bucket
+        self.size = 0
+
+    def push(self, priority, state):
+        h = priority - state.cost
+        bucket = self.buckets.get(priority)
+        if bucket is None:
+            bucket = self.buckets[priority] = ({}, [])
+            heapq.heappush(self.f_values, priority)
+        stacks, h_values = bucket
+        stack = stacks.get(h)
+        if stack is None:
+            stack = stacks[h] = []
+            heapq.heappush(h_values, h)
+        stack.append(state)
+        self.size += 1
+
+    def pop(self):
+        f = self.f_values[0]
+        stacks, h_values = self.buckets[f]
+        h = h_values[0]
+        stack = stacks[h]
+        state = stack.pop()
+        if not stack:
+            del stacks[h]
+            heapq.heappop(h_values)
+            if not h_values:
+                del self.buckets[f]
+                heapq.heappop(self.f_values)
+        self.size -= 1
+        return state
+
+    def __len__(self):
+        return self.size
+
+FRONTIERS = {FIFO: FifoFrontier, LIFO: LifoFrontier, HEAP: HeapFrontier, BUCKET: BucketFrontier}
+DUPLICATE_POLICIES = (DUPLICATES_NONE, DUPLICATES_CLOSED, DUPLICATES_BEST)
+
+# The loop shared by BFS, UCS and A*. frontier is one of FRONTIERS; priority(state, parent) gives the order
+# for HEAP/BUCKET frontiers (None for FIFO/LIFO), and a successor whose priority is inf is dropped.
+# With normalize_keys, duplicates are keyed on the stones plus Ares's reachable region rather than the exact
+# cell of Ares; that is only sound when the order ignores how far Ares walked, i.e. for BFS.
+# Returns the usual (final_state, nodes_generated, time_taken, memory_used, pruned).
+def best_first_search(board, frontier=FIFO, priority=None, duplicates=DUPLICATES_CLOSED, deadlock_detection=False,
+                      normalize_player=False, normalize_keys=False, verify_hashes=False, budget=None, measure=MEASURE_TRACEMALLOC,
+                      progress=None):
+    if duplicates not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy {duplicates!r}, expected one of {DUPLICATE_POLICIES}.")
+    initial_state = board.initial_state()
+    queue = FRONTIERS[frontier]()
+    push, pop = queue.push, queue.pop
+    closed = set() if duplicates != DUPLICATES_NONE else None  # Zobrist hashes of expanded states
+    best = {} if duplicates == DUPLICATES_BEST else None  # Zobrist hash -> lowest priority queued
+    filter_successors = closed is not None and not normalize_keys  # Successor zkeys are never normalized
+    hash_verifier = HashVerifier() if verify_hashes else None
+    inf = float('inf')
+    nodes_generated = 0
+    pruned = new_pruning_counters(deadlock_detection)
+
+    measurement = Measurement(measure).start()
+    try:
+        if budget:
+            budget.start()
+        if progress is not None:
+            progress.start()
+        push(priority(initial_state, None) if priority else 0, initial_state)
+
+        while queue:
+            current_state = pop()
+            nodes_generated += 1
+            if budget:
+                limit = budget.exceeded(nodes_generated)
+                if limit:
+                    return budget_result(limit, nodes_generated, measurement, pruned, len(queue), len(closed) if closed is not None else None)
+            if progress is not None and nodes_generated >= progress.next_check:
+                progress.report(nodes_generated, len(queue), len(closed) if closed is not None else None,
+                                priority(current_state, current_state.parent) if priority else None, current_state.cost)
+            ares_cell, stone_cells = board.unpack_cells(current_state.key)
+
+            if board.is_goal(stone_cells):
+                time_taken, memory_used = measurement.stop()
+                return board.decompress(current_state, normalize_player), nodes_generated, time_taken, memory_used, pruned
+
+            region = None
+            if closed is not None:
+                if normalize_keys:
+                    region = board.walk_distances(ares_cell, set(stone_cells))
+                    state_key, exact_key = board.normalized_key(current_state, ares_cell, region)
+                else:
+                    state_key, exact_key = current_state.zkey, current_state.key
+                if hash_verifier:
+                    hash_verifier.check(state_key, exact_key)  # Whether it is found in closed or added to it
+                if state_key in closed:
+                    continue
+                closed.add(state_key)
+
+            # Player-normalized mode only generates pushes and folds the walking into each push's cost.
+            # The key keeps Ares's exact cell after the push, since the walk to the next push depends on it.
+            if normalize_player:
+                successors = get_push_successors(current_state, ares_cell, stone_cells, board, pruned, deadlock_detection, region)
+            else:
+                successors = get_compact_successors(current_state, ares_cell, stone_cells, board, pruned, deadlock_detection)
+
+            for successor in successors:
+                if filter_successors and successor.zkey in closed:
+                    if hash_verifier:
+                        hash_verifier.check(successor.zkey, successor.key)
+                    continue
+                successor_priority = priority(successor, current_state) if priority else 0
+                if successor_priority == inf:
+                    continue
+                if best is not None:
+                    if hash_verifier:
+                        hash_verifier.check(successor.zkey, successor.key)  # Either found in best or added to it below
+                    if successor_priority >= best.get(successor.zkey, inf):
+                        continue
+                    best[successor.zkey] = successor_priority
+                push(successor_priority, successor)
+
+        time_taken, memory_used = measurement.stop()
+        return None, nodes_generated, time_taken, memory_used, pruned
+    finally:
+        measurement.stop()  # Already stopped unless the search raised; ends tracing either way
+
+# Runs search on one map and returns its result dict; failures never raise but end up in error_message.
+# algorithm_key is the short name the result is filed under (e.g. "A_star"), used for the cache and the
+# progress label. With a cache (anything with key/get/put, see solution_cache.SolutionCache), a map already
+# solved by the same algorithm, options, measurement mode and solver code is read back instead of searched again.
+def solve_input_file(search, algorithm_name, input_path, deadlock_detection=False, normalize_player=False, budget=None,
+                     measure=MEASURE_TRACEMALLOC, progress=None, algorithm_key=None, cache=None) -> Dict[str, Any]:
+    input_file = os.path.basename(input_path)
+    result = {
+        "input_file": input_file,
+        "algorithm": algorithm_name,
+        "algorithm_key": algorithm_key,
+        "final_state": None,
+        "nodes_generated": None,
+        "time_taken": None,
+        "memory_used": None,
+        "pruned": None,
+        "measure": measure,
+        "error_message": None
+    }
+
+    try:
+        # Parse input data
+        weights, grid, error_message = parse_input(input_path)
+        if error_message:
+            # If parsing error, save the error message in the result and skip the search
+            result["error_message"] = error_message
+            return result
+
+        if cache:
+            key = cache.key(grid, weights, algorithm_key, deadlock_detection, normalize_player, measure)
+            cached = cache.get(key)
+            if cached:
+                result.update(cached)
+                result["cached"] = True
+                return result
+
+        job_progress = progress.for_job(f"{algorithm_key or algorithm_name}/{input_file}") if progress is not None else None
+        final_state, nodes_generated, time_taken, memory_used, pruned = search(weights, grid, deadlock_detection, normalize_player, budget=budget, measure=measure,
+                                                                               progress=job_progress)
+
+        # Store results; if no solution was found, mark it in the final_state
+        if isinstance(final_state, BudgetExceeded):
+            result["final_state"] = str(final_state)
+            result["budget_exceeded"] = final_state
+        else:
+            result["final_state"] = final_state if final_state else "No solution found"
+        result["nodes_generated"] = nodes_generated
+        result["time_taken"] = time_taken
+        result["memory_used"] = memory_used
+        result["pruned"] = pruned
+        if cache:
+            cache.put(key, result)
+
+    except FileNotFoundError:
+        result["error_message"] = f"File not found: {input_path}"
+    except IOError as e:
+        result["error_message"] = f"I/O error with file {input_path}: {e}"
+    except Exception as e:
+        result["error_message"] = f"An unexpected error occurred while processing {input_file}: {e}"
+
+    return result
+
+# Runs search on every .txt map in input_folder (sorted by name) and yields each result dict as soon as
+# its puzzle is done, so callers can write or show results while the rest are still being solved
+# With progress, every puzzle reports under its own label (see SearchProgress.for_job).
+def process_input_files(search, algorithm_name, input_folder, deadlock_detection=False, normalize_player=False, budget=None,
+                        measure=MEASURE_TRACEMALLOC, progress=None, algorithm_key=None, cache=None) -> Iterator[Dict[str, Any]]:
+    for input_file in sorted(os.listdir(input_folder)):
+        input_path = os.path.join(input_folder, input_file)
+        if os.path.isfile(input_path) and input_file.endswith(".txt"):
+            yield solve_input_file(search, algorithm_name, input_path, deadlock_detection, normalize_player, budget, measure, progress,
+                                   algorithm_key, cache)
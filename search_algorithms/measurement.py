@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import threading
+import tracemalloc
+
+# How a search measures its memory. Time is always taken with perf_counter.
+#   none:        no memory measurement at all (memory used is reported as 0), for throughput numbers
+#   rss:         peak resident set size over the run minus the RSS it started with, sampled on a thread
+#   tracemalloc: peak of Python allocations during the run; exact, but slows allocation-heavy code down
+MEASURE_NONE = "none"
+MEASURE_RSS = "rss"
+MEASURE_TRACEMALLOC = "tracemalloc"
+MEASUREMENT_MODES = (MEASURE_NONE, MEASURE_RSS, MEASURE_TRACEMALLOC)
+
+RSS_SAMPLE_INTERVAL = 0.005  # Seconds between RSS samples
+
+# Resident set size of this process in bytes, or None where it cannot be read
+def current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows: RSS is not available
+    # Without /proc only the peak is available (kilobytes on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class Measurement:
+    # Time and peak memory of one search run. The peak only covers this run: tracemalloc's peak is
+    # reset when the run starts, and RSS is reported relative to what the process held at that point.
+    def __init__(self, mode=MEASURE_TRACEMALLOC):
+        if mode not in MEASUREMENT_MODES:
+            raise ValueError(f"Unknown measurement mode {mode!r}, expected one of {MEASUREMENT_MODES}.")
+        self.mode = mode
+
+    def start(self):
+        if self.mode == MEASURE_TRACEMALLOC:
+            # Someone else already tracing (e.g. a caller measuring a whole batch) keeps their session;
+            # only the peak is reset so it starts from this run
+            self.owns_tracemalloc = not tracemalloc.is_tracing()
+            if self.owns_tracemalloc:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+            self.baseline = tracemalloc.get_traced_memory()[0]
+        elif self.mode == MEASURE_RSS:
+            self.baseline = current_rss() or 0
+            self.peak = self.baseline
+            self.stopped = threading.Event()
+            self.sampler = threading.Thread(target=self._sample_rss, daemon=True)
+            self.sampler.start()
+        self.start_time = time.perf_counter()
+        self.result = None
+        return self
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    # Ends the run and returns (time taken in seconds, peak memory in bytes). Stopping again returns the same
+    # figures, so searches can also stop in a finally block and never leave tracemalloc or the sampler running.
+    def stop(self):
+        if self.result is not None:
+            return self.result
+        time_taken = self.elapsed()
+        memory_used = 0
+        if self.mode == MEASURE_TRACEMALLOC:
+            memory_used = tracemalloc.get_traced_memory()[1] - self.baseline
+            if self.owns_tracemalloc:
+                tracemalloc.stop()
+        elif self.mode == MEASURE_RSS:
+            self.stopped.set()
+            self.sampler.join()
+            self._record_rss()
+            memory_used = self.peak - self.baseline
+        self.result = (time_taken, memory_used)
+        return self.result
+
+    def _sample_rss(self):
+        while not self.stopped.wait(RSS_SAMPLE_INTERVAL):
+            self._record_rss()
+
+    def _record_rss(self):
+        rss = current_rss()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
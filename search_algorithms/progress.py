@@ -0,0 +1,86 @@
+import sys
+import json
+import time
+
+class ProgressEvent:
+    # One snapshot of a running search. f and g belong to the node being expanded when the event fired;
+    # for UCS and A* they never go down, so they are the best lower bound on the cost so far. IDA* reports
+    # its current threshold as f. Sizes the search does not keep (e.g. IDA*'s visited states) are None.
+    def __init__(self, label, elapsed, nodes_generated, nodes_per_second, frontier_size, visited_size, f, g):
+        self.label = label
+        self.elapsed = elapsed  # Seconds since the search started
+        self.nodes_generated = nodes_generated
+        self.nodes_per_second = nodes_per_second  # Over the time since the previous event
+        self.frontier_size = frontier_size
+        self.visited_size = visited_size
+        self.f = f
+        self.g = g
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in ("label", "elapsed", "nodes_generated", "nodes_per_second",
+                                                       "frontier_size", "visited_size", "f", "g")}
+
+class SearchProgress:
+    # Progress events from inside the search loops, handed to every listener (any callable taking a
+    # ProgressEvent) at most once per interval seconds. Like SearchBudget, the loops only look at it every
+    # check_interval nodes, and a search run without one pays a single "is not None" test per node.
+    # Everything here pickles, so one instance can be handed to worker processes.
+    def __init__(self, *listeners, interval=1.0, check_interval=1024, label=None):
+        self.listeners = list(listeners)
+        self.interval = interval
+        self.check_interval = check_interval
+        self.label = label
+        self.start()
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    # Same listeners and interval, labelled for one job (e.g. "A_star/input-03.txt")
+    def for_job(self, label):
+        return SearchProgress(*self.listeners, interval=self.interval, check_interval=self.check_interval, label=label)
+
+    # Called by each search when it starts, so one instance can be reused across jobs
+    def start(self):
+        self.start_time = self.last_time = time.perf_counter()
+        self.last_nodes = 0
+        # Nobody listening: the loops never get past their cheap node-count test
+        self.next_check = self.check_interval if self.listeners else float('inf')
+
+    def report(self, nodes_generated, frontier_size=None, visited_size=None, f=None, g=None):
+        self.next_check = nodes_generated + self.check_interval
+        now = time.perf_counter()
+        if now - self.last_time < self.interval:
+            return
+        rate = (nodes_generated - self.last_nodes) / max(now - self.last_time, 1e-9)
+        event = ProgressEvent(self.label, now - self.start_time, nodes_generated, rate, frontier_size, visited_size, f, g)
+        self.last_time = now
+        self.last_nodes = nodes_generated
+        for listener in self.listeners:
+            listener(event)
+
+class ConsoleReporter:
+    # One line per event; stream None means whatever sys.stderr is at the time (and keeps this picklable)
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, event):
+        parts = [f"{event.elapsed:8.1f}s", f"{event.nodes_generated:>12,} nodes", f"{event.nodes_per_second:>10,.0f} nodes/s"]
+        if event.frontier_size is not None:
+            parts.append(f"frontier {event.frontier_size:,}")
+        if event.visited_size is not None:
+            parts.append(f"visited {event.visited_size:,}")
+        if event.f is not None:
+            parts.append(f"f {event.f:g}")
+        if event.g is not None:
+            parts.append(f"g {event.g}")
+        label = f"[{event.label}] " if event.label else ""
+        print(label + "  ".join(parts), file=self.stream or sys.stderr, flush=True)
+
+class JsonlReporter:
+    # Appends each event as one JSON line. The file is opened per event so worker processes can share it.
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, event):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(event.as_dict()) + "\n")
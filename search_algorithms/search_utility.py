@@ -2,7 +2,7 @@ import os
 import heapq
 import time
 import tracemalloc
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterator
 
 class State:
     def __init__(self, ares_pos, stones, cost, path=""):
@@ -13,7 +13,77 @@ class State:
 
     def __lt__(self, other):
         return self.cost < other.cost
-    
+
+# Action codes stored per node; the code indexes both DIRECTIONS and ACTIONS
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+ACTIONS = "udlrUDLR"  # Moves first, then the matching pushes (code + 4)
+
+class CompactState:
+    # Frontier/visited form of a State: Ares and the stones live in one packed int (see StateCodec).
+    # Instead of a path string each node keeps its parent and the action code that produced it.
+    __slots__ = ("key", "cost", "parent", "action", "zkey")
+
+    def __init__(self, key, cost, parent=None, action=None, zkey=0):
+        self.key = key  # Packed cell indexes of Ares and every stone
+        self.cost = cost  # Accumulated cost to reach this state
+        self.parent = parent  # CompactState this one was generated from (None for the initial state)
+        self.action = action  # Index into ACTIONS of the move/push taken from the parent
+        self.zkey = zkey  # 64-bit Zobrist hash of the same layout, the key used by visited sets
+
+    def __lt__(self, other):
+        return self.cost < other.cost
+
+class StateCodec:
+    # Packs (ares_pos, stones) into a single int. Every position becomes the flat cell index
+    # row * width + col and takes cell_bits bits: Ares in the lowest field, then stone 0, stone 1, ...
+    # Stones keep their index (and so their weight) across pushes, so the order of the fields matters.
+    def __init__(self, grid):
+        self.width = max((len(row) for row in grid), default=1)
+        self.stone_count = sum(row.count('$') + row.count('*') for row in grid)
+        self.cell_bits = max(1, (len(grid) * self.width - 1).bit_length())
+        self.cell_mask = (1 << self.cell_bits) - 1
+
+    def cell(self, pos):
+        return pos[0] * self.width + pos[1]
+
+    def position(self, cell):
+        return divmod(cell, self.width)
+
+    def pack(self, ares_pos, stones):
+        key = 0
+        for stone_pos in reversed(stones):
+            key = (key << self.cell_bits) | self.cell(stone_pos)
+        return (key << self.cell_bits) | self.cell(ares_pos)
+
+    def unpack(self, key):
+        ares_cell, stone_cells = self.unpack_cells(key)
+        return self.position(ares_cell), [self.position(cell) for cell in stone_cells]
+
+    # Same as unpack but leaves every position as its flat cell index
+    def unpack_cells(self, key):
+        ares_cell = key & self.cell_mask
+        stone_cells = []
+        for _ in range(self.stone_count):
+            key >>= self.cell_bits
+            stone_cells.append(key & self.cell_mask)
+        return ares_cell, stone_cells
+
+    def compress(self, state) -> CompactState:
+        return CompactState(self.pack(state.ares_pos, state.stones), state.cost)
+
+    # Rebuilds the full State, path included; only meant for the goal state
+    def decompress(self, compact_state) -> State:
+        ares_pos, stones = self.unpack(compact_state.key)
+        return State(ares_pos, stones, compact_state.cost, reconstruct_path(compact_state))
+
+# Walk the parent chain back to the initial state and spell out the actions taken
+def reconstruct_path(compact_state):
+    actions = []
+    while compact_state.parent is not None:
+        actions.append(ACTIONS[compact_state.action])
+        compact_state = compact_state.parent
+    return "".join(reversed(actions))
+
 def parse_input(file):
     try:
         with open(file, 'r') as f:
@@ -61,13 +131,6 @@ def push_stone(ares_pos, stone_pos, grid, stones):
         return new_stone_pos
     return None
 
-def goal_state(state, grid):
-    for stone_pos in state.stones:
-        x, y = stone_pos
-        if grid[x][y] not in {'.', '+', '*'}:
-            return False
-    return True
-
 def get_successors(state, weights, grid) -> List[State]:
     successors = []
     ares_x, ares_y = state.ares_pos
@@ -88,4 +151,110 @@ def get_successors(state, weights, grid) -> List[State]:
                     stone_weight = weights[i]
                     successors.append(State(new_ares_pos, new_stones, state.cost + stone_weight + 1, state.path + push))
 
-    return successors
\ No newline at end of file
+    return successors
+
+# Same successors, in the same order, as get_successors, generated from the precompiled Board.
+# Ares and the stones are flat cell indexes; the successor keys are patched in place rather than repacked.
+# Pushes onto dead squares (see Board.live) are dropped and counted in pruned. With detect_deadlocks,
+# pushes that leave the moved stone in a 2x2 block or freeze deadlock are dropped as well.
+def get_compact_successors(state, ares_cell, stone_cells, board, pruned, detect_deadlocks=False) -> List[CompactState]:
+    successors = []
+    neighbours = board.neighbours
+    zobrist_player = board.zobrist_player
+    occupied = {cell: i for i, cell in enumerate(stone_cells)}  # Stone cell -> stone index
+    key = state.key
+    base = ares_cell * 4
+
+    for code in range(4):
+        target = neighbours[base + code]
+        if target < 0:
+            continue
+
+        i = occupied.get(target)
+        if i is None:
+            zkey = state.zkey ^ zobrist_player[ares_cell] ^ zobrist_player[target]
+            successors.append(CompactState(key ^ ares_cell ^ target, state.cost + 1, state, code, zkey))
+            continue
+
+        beyond = neighbours[target * 4 + code]
+        if beyond >= 0 and beyond not in occupied:
+            if not board.live[beyond]:
+                pruned["dead_squares"] += 1
+                continue
+            if detect_deadlocks and is_deadlocked_push(board, occupied, i, target, beyond, pruned):
+                continue
+            shift = board.stone_shifts[i]
+            new_key = key ^ ares_cell ^ target ^ (target << shift) ^ (beyond << shift)
+            zobrist_stone = board.zobrist_stones[i]
+            zkey = state.zkey ^ zobrist_player[ares_cell] ^ zobrist_player[target] ^ zobrist_stone[target] ^ zobrist_stone[beyond]
+            successors.append(CompactState(new_key, state.cost + board.weights[i] + 1, state, code + 4, zkey))
+
+    return successors
+
+# Push-only successors for the player-normalized mode: Ares walks (1 per step) to any cell of region,
+# his reachable area, and pushes from there. Each successor keeps the exact Ares cell after the push,
+# so its cost stays exact for UCS and A*.
+def get_push_successors(state, ares_cell, stone_cells, board, pruned, detect_deadlocks=False, region=None) -> List[CompactState]:
+    successors = []
+    neighbours = board.neighbours
+    zobrist_player = board.zobrist_player
+    occupied = {cell: i for i, cell in enumerate(stone_cells)}  # Stone cell -> stone index
+    if region is None:
+        region = board.walk_distances(ares_cell, occupied)
+    key = state.key
+
+    for i, target in enumerate(stone_cells):
+        for code in range(4):
+            steps = region.get(neighbours[target * 4 + (code ^ 1)])  # Ares has to stand behind the stone
+            if steps is None:
+                continue
+            beyond = neighbours[target * 4 + code]
+            if beyond < 0 or beyond in occupied:
+                continue
+            if not board.live[beyond]:
+                pruned["dead_squares"] += 1
+                continue
+            if detect_deadlocks and is_deadlocked_push(board, occupied, i, target, beyond, pruned):
+                continue
+            shift = board.stone_shifts[i]
+            new_key = key ^ ares_cell ^ target ^ (target << shift) ^ (beyond << shift)
+            zobrist_stone = board.zobrist_stones[i]
+            zkey = state.zkey ^ zobrist_player[ares_cell] ^ zobrist_player[target] ^ zobrist_stone[target] ^ zobrist_stone[beyond]
+            successors.append(CompactState(new_key, state.cost + steps + board.weights[i] + 1, state, code + 4, zkey))
+
+    return successors
+
+# Debug aid for Zobrist keys: remembers the exact packed key behind every hash it is shown and
+# raises as soon as two different layouts share one hash
+class HashVerifier:
+    # Exact packed key behind every Zobrist hash a search has stored. The search calls check both when it
+    # stores a hash and whenever a lookup of a hash succeeds: a hit for a different packed key is a collision
+    # that would otherwise silently drop a state.
+    def __init__(self):
+        self.keys = {}  # Zobrist hash -> packed key
+
+    def check(self, zkey, key):
+        known = self.keys.setdefault(zkey, key)
+        if known != key:
+            raise RuntimeError(f"Zobrist collision: hash {zkey:#018x} maps to packed keys {known:#x} and {key:#x}")
+
+# Only looks at the neighbourhood of the stone that just moved from target to beyond
+def is_deadlocked_push(board, occupied, i, target, beyond, pruned):
+    del occupied[target]
+    occupied[beyond] = i
+    if board.is_block_deadlock(beyond, occupied):
+        pruned["blocks"] += 1
+        deadlocked = True
+    elif board.is_freeze_deadlock(beyond, occupied):
+        pruned["freeze"] += 1
+        deadlocked = True
+    else:
+        deadlocked = False
+    del occupied[beyond]
+    occupied[target] = i
+    return deadlocked
+
+def new_pruning_counters(deadlock_detection=False):
+    if deadlock_detection:
+        return {"dead_squares": 0, "freeze": 0, "blocks": 0}
+    return {"dead_squares": 0}
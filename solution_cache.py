@@ -0,0 +1,157 @@
+import os
+import json
+import glob
+import time
+import hashlib
+import tempfile
+from functools import lru_cache
+from search_algorithms.search_utility import State
+from search_algorithms.measurement import MEASURE_TRACEMALLOC
+
+project_root = os.path.abspath(os.path.dirname(__file__))
+CACHE_FOLDER = os.path.join(project_root, ".solution_cache")
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+EVICT_TO = 0.75  # An eviction trims the folder to this fraction of max_bytes, so the next one is many puts away
+TEMPORARY_MAX_AGE = 60  # Seconds after which a .tmp file cannot belong to a write still in progress
+
+# Bytes in each cache folder as this process last counted them, plus what it has written since. A put
+# only lists the folder when this passes max_bytes; writes by other processes are counted at that point.
+folder_sizes = {}
+SOLVER_FOLDER = os.path.join(project_root, "search_algorithms")
+
+# Hash of the solver sources, part of every key: editing any search file makes the old entries unreachable
+@lru_cache(maxsize=1)
+def solver_version():
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(SOLVER_FOLDER, "*.py"))):
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+# Trailing spaces and blank rows do not change a puzzle, so they do not change its key either
+def normalize_grid(grid):
+    rows = ["".join(row).rstrip() for row in grid]
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+class SolutionCache:
+    # Finished results on disk, one JSON file per (grid, weights, algorithm, options, measure, solver version).
+    # Entries are evicted least recently used first once the folder grows past max_bytes; a hit counts
+    # as a use. Only plain data is stored, so the cache can be handed to worker processes.
+    def __init__(self, folder=CACHE_FOLDER, max_bytes=CACHE_MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+
+    # measure is part of the key: time_taken/memory_used from one measurement mode are not the figures
+    # a run in another mode asked for
+    def key(self, grid, weights, algorithm, deadlock_detection=False, normalize_player=False, measure=MEASURE_TRACEMALLOC):
+        content = json.dumps({
+            "grid": normalize_grid(grid),
+            "weights": list(weights),
+            "algorithm": algorithm,
+            "deadlock_detection": deadlock_detection,
+            "normalize_player": normalize_player,
+            "measure": measure,
+            "solver": solver_version(),
+        }, sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.folder, f"{key}.json")
+
+    # Result dict as process_input_file builds it, or None on a miss
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+        if entry["final_state"] is not None:
+            entry["final_state"] = State(None, None, entry["final_state"]["cost"], entry["final_state"]["path"])
+        else:
+            entry["final_state"] = entry.pop("message")
+        return entry
+
+    # Only solved (or proven unsolvable) results are kept; errors and budget cut-offs depend on the run
+    def put(self, key, result):
+        if result.get("error_message") or result.get("budget_exceeded"):
+            return
+        final_state = result["final_state"]
+        entry = {name: result[name] for name in ("algorithm", "nodes_generated", "time_taken", "memory_used", "pruned")}
+        entry["measure"] = result.get("measure")
+        entry["error_message"] = None
+        if isinstance(final_state, str):
+            entry["final_state"] = None
+            entry["message"] = final_state
+        else:
+            entry["final_state"] = {"cost": final_state.cost, "path": final_state.path}
+
+        data = json.dumps(entry)
+        os.makedirs(self.folder, exist_ok=True)
+        # Write then rename, so a reader (or another worker) never sees half a file
+        fd, temporary = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            remove_file(temporary)
+            raise
+
+        # Only list the folder when this put may have taken it past max_bytes
+        size = folder_sizes.get(self.folder)
+        if size is None or size + len(data) > self.max_bytes:
+            self.evict()
+        else:
+            folder_sizes[self.folder] = size + len(data)
+
+    def invalidate(self, key):
+        remove_file(self.path(key))
+
+    def clear(self):
+        for _, _, path in self.scan():
+            remove_file(path)
+        folder_sizes.pop(self.folder, None)
+
+    # Trims the folder to EVICT_TO of max_bytes, least recently used first, once it is over max_bytes
+    def evict(self):
+        entries = sorted(self.scan())
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in entries:
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+                remove_file(path)
+                total -= size
+        folder_sizes[self.folder] = total
+
+    # (mtime, size, path) of every entry in the folder. Temporary files older than TEMPORARY_MAX_AGE were
+    # left by a writer that was killed mid-write (a cancelled UI solve, a pool shutdown) and are removed.
+    def scan(self):
+        entries = []
+        now = time.time()
+        try:
+            files = os.scandir(self.folder)
+        except FileNotFoundError:
+            return entries
+        with files:
+            for file in files:
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    continue  # Removed by another worker in the meantime
+                if file.name.endswith(".json"):
+                    entries.append((stat.st_mtime, stat.st_size, file.path))
+                elif file.name.endswith(".tmp") and now - stat.st_mtime > TEMPORARY_MAX_AGE:
+                    remove_file(file.path)
+        return entries
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
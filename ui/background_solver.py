@@ -0,0 +1,63 @@
+import time
+import queue
+import multiprocessing
+from process_algorithms import process_input_file
+from solution_cache import SolutionCache
+from search_algorithms.progress import SearchProgress
+from search_algorithms.measurement import MEASURE_RSS
+
+# Nothing in this module touches pygame: the worker is started with "spawn", so it imports only what it
+# needs instead of inheriting the UI's window and SDL state.
+PROGRESS_INTERVAL = 0.2  # Seconds between progress events sent back to the UI
+SOLVE_MEASURE = MEASURE_RSS  # tracemalloc would make the solve several times slower
+
+# Runs in the worker process. Progress events and finally the result dict go back through events;
+# process_input_file stores the solution in the cache, so the next request for this map is instant.
+def solve_worker(algorithm, input_path, events):
+    progress = SearchProgress(lambda event: events.put(("progress", event.as_dict())), interval=PROGRESS_INTERVAL)
+    result = process_input_file(algorithm, input_path, measure=SOLVE_MEASURE, cache=SolutionCache(), progress=progress)
+    events.put(("result", result))
+
+class BackgroundSolve:
+    # One solve of one map on a worker process. The UI calls poll() once per frame: it never blocks,
+    # keeps the latest progress event in progress and returns True once result is set.
+    def __init__(self, algorithm, algorithm_name, input_path):
+        self.algorithm_name = algorithm_name
+        context = multiprocessing.get_context("spawn")
+        self.events = context.Queue()
+        self.process = context.Process(target=solve_worker, args=(algorithm, input_path, self.events), daemon=True)
+        self.process.start()
+        self.start_time = time.perf_counter()
+        self.progress = None  # ProgressEvent.as_dict() of the latest event, None until the search reports
+        self.result = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def poll(self):
+        if self.result is not None:
+            return True
+        self.drain()
+        if self.result is None and not self.process.is_alive():
+            self.drain(timeout=0.5)  # The result may still be on its way through the pipe
+            if self.result is None:
+                self.result = {"algorithm": self.algorithm_name, "final_state": None,
+                               "error_message": f"The solver stopped unexpectedly (exit code {self.process.exitcode})."}
+        return self.result is not None
+
+    def drain(self, timeout=None):
+        while True:
+            try:
+                kind, payload = self.events.get(timeout=timeout) if timeout else self.events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "progress":
+                self.progress = payload
+            else:
+                self.result = payload
+                return
+
+    def cancel(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
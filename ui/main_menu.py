@@ -3,59 +3,118 @@ import os
 import sys
 from .ui_utility import *
 from .pause_menu import choose_algorithm_menu
-from .simulate_game import simulate_single_game
+from .simulate_game import simulate_single_game, stats_from_result, stats_from_record
+from .solve_screen import solving_screen
+from .background_solver import BackgroundSolve, SOLVE_MEASURE
+from .map_catalog import MapCatalog
+from solution_cache import SolutionCache
+from result_sink import find_result, RESULTS_FILE
+from process_algorithms import ALGORITHMS
 
 # Project root and folders for input/output
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 input_folder = os.path.join(project_root, "input")
 output_folder = os.path.join(project_root, "output")
 
-# Initialize list of maps and pagination settings
-map_files = sorted([f for f in os.listdir(input_folder) if f.endswith(".txt")])
+# Every map in the input folder, parsed once; the screens below draw from it without touching the disk
+map_catalog = MapCatalog(input_folder)
 current_map_idx = 0
 
-# Function to load the map and weights from the input file
-def load_map_with_weights(file_path):
-    with open(file_path, 'r') as f:
-        # Read weights from the first line
-        weights = list(map(int, f.readline().strip().split()))
-        
-        # Read the grid layout
-        grid = [list(line.rstrip('\n')) for line in f.readlines()]
-    return grid, weights
-
-# Function to render map with optional page and additional instructions text
-def render_map(grid, weights, page_text, additional_text=""):
+# Thumbnails shown per page of the map gallery
+MAPS_PER_ROW = 3
+MAPS_PER_PAGE = 6
+
+# Solutions from earlier batch runs and background solves; checked before solving anything
+solution_cache = SolutionCache()
+
+# Function to render map (pre-rendered with its stone weights) with optional page and additional instructions text
+def render_map(preview, page_text, additional_text=""):
     screen.fill(BACKGROUND_COLOR)
     
     # Render page indicator
-    page_text_rendered = FONT.render(page_text, True, (0, 0, 0))
+    page_text_rendered = render_text(FONT, page_text, (0, 0, 0))
     screen.blit(page_text_rendered, (WIDTH // 2 - page_text_rendered.get_width() // 2, 10))
 
-    # Counter for weights (to display each weight above the respective stone)
-    weight_index = 0
-
     # Render grid
-    for i, row in enumerate(grid):
-        for j, cell in enumerate(row):
-            x, y = j * SQUARE_SIZE, HEADER_HEIGHT + i * SQUARE_SIZE
-            screen.blit(IMAGES.get(cell, IMAGES[" "]), (x, y))
-            
-            # If the cell is a stone or a stone in the basket (marked by $ or *), display the corresponding weight above it
-            if (cell == '$' or cell == '*') and weight_index < len(weights):
-                weight_text = FONT.render(str(weights[weight_index]), True, (255, 255, 255))
-                screen.blit(weight_text, (x + SQUARE_SIZE // 4, y - 5))  # Display weight above the yarn
-                weight_index += 1
+    screen.blit(preview, (0, HEADER_HEIGHT))
 
     # Render navigation instructions
-    instructions = FONT.render("Use LEFT and RIGHT arrows to navigate maps.", True, (0, 0, 0))
+    instructions = render_text(FONT, "Use LEFT and RIGHT arrows to navigate maps.", (0, 0, 0))
     screen.blit(instructions, (WIDTH // 2 - instructions.get_width() // 2, HEIGHT + HEADER_HEIGHT + 10))
 
     # Render additional text, if provided
     if additional_text:
-        additional_text_rendered = FONT.render(additional_text, True, (0, 0, 0))
+        additional_text_rendered = render_text(FONT, additional_text, (0, 0, 0))
         screen.blit(additional_text_rendered, (WIDTH // 2 - additional_text_rendered.get_width() // 2, HEIGHT + HEADER_HEIGHT - 40))
 
+# Thumbnail buttons for one page of the gallery, as (map index, MapButton)
+def gallery_buttons(page):
+    buttons = []
+    first = page * MAPS_PER_PAGE
+    for index in range(first, min(first + MAPS_PER_PAGE, len(map_catalog))):
+        row, column = divmod(index - first, MAPS_PER_ROW)
+        pos = (WIDTH // 2 + (column - 1) * 330, HEADER_HEIGHT + 150 + row * 220)
+        buttons.append((index, MapButton(f"Map {index + 1}", pos, map_catalog[index].get_thumbnail(THUMBNAIL_SIZE))))
+    return buttons
+
+# Function to show all maps as thumbnails, a page at a time; clicking one opens it in the map selection screen
+def map_gallery_screen():
+    global current_map_idx
+    page = current_map_idx // MAPS_PER_PAGE
+    buttons = None
+
+    while True:
+        # Thumbnails are rebuilt only when the page or the maps on disk change
+        if map_catalog.refresh() or buttons is None:
+            page_count = max(1, -(-len(map_catalog) // MAPS_PER_PAGE))
+            page = min(page, page_count - 1)
+            buttons = gallery_buttons(page)
+
+        screen.fill(BACKGROUND_COLOR)
+        page_text = render_text(FONT, f"Page {page + 1} of {page_count}", (0, 0, 0))
+        screen.blit(page_text, (WIDTH // 2 - page_text.get_width() // 2, 10))
+
+        mouse_pos = pygame.mouse.get_pos()
+        for _, button in buttons:
+            button.draw(screen, mouse_pos)
+
+        # Draw navigation arrows for previous and next pages
+        if page > 0:
+            draw_arrow_button(screen, "left", (60, HEIGHT - 40), mouse_pos)
+        if page < page_count - 1:
+            draw_arrow_button(screen, "right", (WIDTH - 60, HEIGHT - 40), mouse_pos)
+
+        instructions = render_text(FONT, "Click a map to open it.", (0, 0, 0))
+        screen.blit(instructions, (WIDTH // 2 - instructions.get_width() // 2, HEIGHT + HEADER_HEIGHT + 10))
+
+        # Create a back button
+        back_button = Button("Back", (30, 20), font = small_font)
+        back_button.draw(screen, mouse_pos)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if back_button.is_clicked(event.pos):
+                    return  # Return to main menu
+                elif page > 0 and pygame.Rect(40, HEIGHT - 60, 40, 40).collidepoint(event.pos):
+                    page -= 1
+                    buttons = None
+                elif page < page_count - 1 and pygame.Rect(WIDTH - 80, HEIGHT - 60, 40, 40).collidepoint(event.pos):
+                    page += 1
+                    buttons = None
+                else:
+                    for index, button in buttons:
+                        if button.is_clicked(event.pos):
+                            current_map_idx = index
+                            map_selection_screen()
+                            page = current_map_idx // MAPS_PER_PAGE  # Follow the map the player browsed to
+                            buttons = None
+                            break
+
+        pygame.display.flip()
+
 # Function to render the map display with navigation arrows and click-to-select
 def map_selection_screen():
     global current_map_idx
@@ -63,22 +122,24 @@ def map_selection_screen():
 
     # Main loop for map selection screen
     while running:
-        screen.fill(BACKGROUND_COLOR)
-
-        # Load and display the current map along with stone weights
-        map_file = os.path.join(input_folder, map_files[current_map_idx])
-        grid, weights = load_map_with_weights(map_file)  # Load map and weights
+        # The current map and its stone weights, as parsed by the catalog (re-parsed only if the file changed)
+        map_catalog.refresh()
+        if len(map_catalog) == 0:
+            return
+        current_map_idx = min(current_map_idx, len(map_catalog) - 1)
+        entry = map_catalog[current_map_idx]
+        map_file, grid, weights = entry.path, entry.grid, entry.weights
         map_number = current_map_idx + 1
-        page_text = f"Map {map_number} of {len(map_files)}"
+        page_text = f"Map {map_number} of {len(map_catalog)}"
 
         # Render map centered on the screen with weights displayed above stones
-        render_map(grid, weights, page_text, additional_text="Click to select this map")
+        render_map(entry.get_preview(), page_text, additional_text="Click to select this map")
 
         # Draw navigation arrows for previous and next maps
         mouse_pos = pygame.mouse.get_pos()
         if current_map_idx > 0:
             draw_arrow_button(screen, "left", (60, HEIGHT - 40), mouse_pos)
-        if current_map_idx < len(map_files) - 1:
+        if current_map_idx < len(map_catalog) - 1:
             draw_arrow_button(screen, "right", (WIDTH - 60, HEIGHT - 40), mouse_pos)
 
         # Create a back button
@@ -98,7 +159,7 @@ def map_selection_screen():
                 elif current_map_idx > 0 and pygame.Rect(40, HEIGHT - 60, 40, 40).collidepoint(mouse_pos):
                     current_map_idx -= 1
                 # Navigate to next map
-                elif current_map_idx < len(map_files) - 1 and pygame.Rect(WIDTH - 80, HEIGHT - 60, 40, 40).collidepoint(mouse_pos):
+                elif current_map_idx < len(map_catalog) - 1 and pygame.Rect(WIDTH - 80, HEIGHT - 60, 40, 40).collidepoint(mouse_pos):
                     current_map_idx += 1
                 # Select the current map and go to algorithm choice
                 else:
@@ -106,12 +167,29 @@ def map_selection_screen():
                     chosen_algorithm = choose_algorithm_menu(screen, map_number)
                     if chosen_algorithm:
                         # Define output file path based on chosen algorithm
-                        algorithm_output_folder = os.path.join(output_folder, chosen_algorithm.replace("*", "_star"))
+                        algorithm = chosen_algorithm.replace("*", "_star")
+                        algorithm_output_folder = os.path.join(output_folder, algorithm)
                         output_file = os.path.join(algorithm_output_folder, f"output-{map_number:02d}.txt")
                         print(f"Map {map_number} selected with {chosen_algorithm} algorithm!")
 
-                        # Run the simulation for the selected map and algorithm
-                        simulate_single_game(map_file, output_file, weights)
+                        # A cached solution for this exact map and solver code wins over the output file. Look it up
+                        # under the measurement mode the background solve below fills the cache with.
+                        cached = solution_cache.get(solution_cache.key(grid, weights, algorithm, measure=SOLVE_MEASURE))
+                        stats = stats_from_result(cached) if cached else None
+                        if stats is None:
+                            # Then the last batch's JSONL results
+                            record = find_result(os.path.join(output_folder, RESULTS_FILE), os.path.basename(map_file), algorithm)
+                            stats = stats_from_record(record) if record else None
+                        if stats is None:
+                            # Not solved yet: solve it now on a worker process while this window shows its progress.
+                            # The worker fills the cache, so choosing this map and algorithm again replays at once.
+                            job = BackgroundSolve(algorithm, ALGORITHMS[algorithm][1], map_file)
+                            result = solving_screen(screen, map_number, chosen_algorithm, job)
+                            stats = stats_from_result(result) if result else None
+
+                        # Run the simulation for the selected map and algorithm (unless the solve was cancelled)
+                        if stats is not None:
+                            simulate_single_game(map_file, output_file, weights, stats=stats)
 
         pygame.display.flip()
 
@@ -182,7 +260,7 @@ def main_menu():
                 sys.exit()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if start_button.is_clicked(mouse_pos):
-                    map_selection_screen()  # Start the map selection screen
+                    map_gallery_screen()  # Start with the map gallery
                 elif credit_button.is_clicked(mouse_pos):
                     show_credits() 
                 elif quit_button.is_clicked(mouse_pos):
@@ -0,0 +1,107 @@
+import os
+import time
+import functools
+import pygame
+from .ui_utility import *
+
+REFRESH_INTERVAL = 1.0  # Seconds between checks of the input folder for added, removed or edited maps
+
+# Function to load the map and weights from the input file
+def load_map_with_weights(file_path):
+    with open(file_path, 'r') as f:
+        # Read weights from the first line
+        weights = list(map(int, f.readline().strip().split()))
+
+        # Read the grid layout
+        grid = [list(line.rstrip('\n')) for line in f.readlines()]
+    return grid, weights
+
+# A grid tile shrunk to size x size pixels, shared by every thumbnail drawn at that size
+@functools.lru_cache(maxsize=64)
+def scaled_tile(cell, size):
+    return pygame.transform.smoothscale(TILES[cell], (size, size))
+
+class MapEntry:
+    # One input file, parsed once. The full-size preview and the thumbnails are rendered the first time
+    # they are asked for and kept until the file changes, when the catalog replaces the whole entry.
+    def __init__(self, path, mtime):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.mtime = mtime
+        try:
+            self.grid, self.weights = load_map_with_weights(path)
+        except (OSError, ValueError) as e:
+            print(f"Error parsing file {path}: {e}")
+            self.grid, self.weights = [], []
+        self.preview = None
+        self.thumbnails = {}  # (width, height) -> Surface
+
+    # The map at full size, with each stone's weight above it, as the selection screen shows it
+    def get_preview(self):
+        if self.preview is None:
+            columns = max((len(row) for row in self.grid), default=0)
+            self.preview = pygame.Surface((max(columns, 1) * SQUARE_SIZE, max(len(self.grid), 1) * SQUARE_SIZE)).convert()
+            self.preview.fill(BACKGROUND_COLOR)
+
+            # Counter for weights (to display each weight above the respective stone)
+            weight_index = 0
+            for i, row in enumerate(self.grid):
+                for j, cell in enumerate(row):
+                    x, y = j * SQUARE_SIZE, i * SQUARE_SIZE
+                    self.preview.blit(TILES.get(cell, TILES[" "]), (x, y))
+                    if (cell == '$' or cell == '*') and weight_index < len(self.weights):
+                        weight_text = render_text(FONT, str(self.weights[weight_index]), (255, 255, 255))
+                        self.preview.blit(weight_text, (x + SQUARE_SIZE // 4, y - 5))  # Display weight above the yarn
+                        weight_index += 1
+        return self.preview
+
+    # The map scaled down to fit in size, keeping square tiles
+    def get_thumbnail(self, size):
+        if size not in self.thumbnails:
+            columns = max((len(row) for row in self.grid), default=0)
+            tile = max(1, min(size[0] // max(columns, 1), size[1] // max(len(self.grid), 1), SQUARE_SIZE))
+            thumbnail = pygame.Surface((max(columns, 1) * tile, max(len(self.grid), 1) * tile)).convert()
+            thumbnail.fill(BACKGROUND_COLOR)
+            for i, row in enumerate(self.grid):
+                for j, cell in enumerate(row):
+                    thumbnail.blit(scaled_tile(cell if cell in TILES else " ", tile), (j * tile, i * tile))
+            self.thumbnails[size] = thumbnail
+        return self.thumbnails[size]
+
+class MapCatalog:
+    # Every map in the input folder, in file name order. Screens read the parsed entries from here instead
+    # of opening files while they draw; refresh() notices added, removed and edited files by their mtimes,
+    # looking at the folder at most once per REFRESH_INTERVAL, and re-parses only the files that changed.
+    def __init__(self, folder):
+        self.folder = folder
+        self.entries = {}  # File name -> MapEntry
+        self.names = []
+        self.last_refresh = None
+        self.refresh(force=True)
+
+    # Returns True if the set of maps or any of them changed
+    def refresh(self, force=False):
+        now = time.perf_counter()
+        if not force and now - self.last_refresh < REFRESH_INTERVAL:
+            return False
+        self.last_refresh = now
+
+        mtimes = {}
+        with os.scandir(self.folder) as files:
+            for file in files:
+                if file.name.endswith(".txt") and file.is_file():
+                    mtimes[file.name] = file.stat().st_mtime_ns
+        changed = mtimes.keys() != self.entries.keys()
+        self.entries = {name: entry for name, entry in self.entries.items() if name in mtimes}
+        for name, mtime in mtimes.items():
+            if name not in self.entries or self.entries[name].mtime != mtime:
+                self.entries[name] = MapEntry(os.path.join(self.folder, name), mtime)
+                changed = True
+        self.names = sorted(self.entries)
+        return changed
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        return self.entries[self.names[index]]
@@ -5,8 +5,8 @@ from .ui_utility import *
 # Algorithm selection menu with default background and map number display
 def choose_algorithm_menu(screen, map_number):
     # Create buttons for algorithms
-    algorithms = ["DFS", "BFS", "UCS", "A*"]
-    algorithm_buttons = [Button(alg, (WIDTH // 2, HEIGHT // 2.25 + i * 75)) for i, alg in enumerate(algorithms)]
+    algorithms = ["DFS", "BFS", "UCS", "A*", "IDA*"]
+    algorithm_buttons = [Button(alg, (WIDTH // 2, HEIGHT // 3 + i * 75)) for i, alg in enumerate(algorithms)]
     
     # Font for displaying the map number
     title_text = title_font.render(f"Map {map_number}", True, TITLE_COLOR)
@@ -16,19 +16,53 @@ def parse_output(file_path):
             "algorithm": lines[0].strip(),
             "steps": int(lines[1].split(": ")[1]),
             "total_weight": int(lines[2].split(": ")[1]),
-            "nodes_generated": int(lines[3].split(": ")[1]),
+            "nodes_generated": int(lines[3].split(": ")[1].split()[0]),  # May be followed by "(Pruned: ...)"
             "time_taken": float(lines[4].split(": ")[1].split()[0]),
             "memory_used": float(lines[5].split(": ")[1].split()[0]),
             "path": lines[6].strip() if len(lines) > 6 else "No solution"
         }
         return stats
-    except:
+    except (IndexError, ValueError):
+        # Not a solved result: the second line is the error, "No solution found" or the budget that was exceeded
         stats = {
             "algorithm": lines[0].strip(),
             "error": lines[1].strip()
         }
         return stats
 
+# Same stats as parse_output, built from a result dict (read back from the solution cache or sent by a background solve)
+def stats_from_result(result):
+    final_state = result["final_state"]
+    if result.get("error_message"):
+        return {"algorithm": result["algorithm"], "error": result["error_message"]}
+    if isinstance(final_state, str):
+        return {"algorithm": result["algorithm"], "error": final_state}
+    return {
+        "algorithm": result["algorithm"],
+        "steps": len(final_state.path),
+        "total_weight": final_state.cost,
+        "nodes_generated": result["nodes_generated"],
+        "time_taken": round(result["time_taken"], 4),  # Same precision as the output files
+        "memory_used": round(result["memory_used"] / 1024, 2),
+        "path": final_state.path
+    }
+
+# Same stats again, from a record of a batch's results.jsonl (see result_sink)
+def stats_from_record(record):
+    if record["status"] != "solved":
+        message = record["error_message"] or ("No solution found" if record["status"] == "no_solution"
+                                              else f"Budget Exceeded: {record['budget']['limit']}")
+        return {"algorithm": record["algorithm"], "error": message}
+    return {
+        "algorithm": record["algorithm"],
+        "steps": record["steps"],
+        "total_weight": record["cost"],
+        "nodes_generated": record["nodes_generated"],
+        "time_taken": round(record["time_taken"], 4),
+        "memory_used": round(record["memory_used"] / 1024, 2),
+        "path": record["path"]
+    }
+
 # Find Ares's position
 def find_ares_position(grid):
     for i, row in enumerate(grid):
@@ -37,8 +71,8 @@ def find_ares_position(grid):
                 return i, j
     return None
 
-# Update grid
-def update_grid(grid, action, weights, total_weight, stone_index_list):
+# Update grid. Cells whose content changed are appended to changed, if given, so only those need redrawing.
+def update_grid(grid, action, weights, total_weight, stone_index_list, changed=None):
     ares_x, ares_y = find_ares_position(grid)
     for dx, dy, move, push in directions:
         if action == move or action == push:
@@ -49,6 +83,8 @@ def update_grid(grid, action, weights, total_weight, stone_index_list):
             if action.islower() and grid[new_x][new_y] in [' ', '.']:
                 grid[new_x][new_y] = '@' if grid[new_x][new_y] == ' ' else '+'
                 grid[ares_x][ares_y] = ' ' if grid[ares_x][ares_y] == '@' else '.'
+                if changed is not None:
+                    changed += [(ares_x, ares_y), (new_x, new_y)]
             
             # Handle push actions (uppercase) and update stone positions
             elif action.isupper():
@@ -64,46 +100,95 @@ def update_grid(grid, action, weights, total_weight, stone_index_list):
                     grid[new_x][new_y] = '@' if grid[new_x][new_y] == '$' else '+'
                     grid[ares_x][ares_y] = ' ' if grid[ares_x][ares_y] == '@' else '.'
                     grid[stone_x][stone_y] = '*' if grid[stone_x][stone_y] == '.' else '$'
+                    if changed is not None:
+                        changed += [(ares_x, ares_y), (new_x, new_y), (stone_x, stone_y)]
             
             # Update total weight with the calculated move cost
             total_weight += move_cost
             break
     return total_weight
 
-# Display table while simulating
-def render_simulation_controls(stats, speed, step_count, total_weight, paused):
-    # Define the control area on the right side of the screen
-    controls_rect = pygame.Rect(WIDTH - 260, 20, 250, 420)
-    pygame.draw.rect(screen, (200, 200, 200), controls_rect, border_radius=10)
+# Draws the replay incrementally. The whole screen is drawn once (and again on restart); after that each step
+# redraws only the cells its action changed and the parts of the control panel whose content changed, and
+# present() hands just those rectangles to pygame.display.update.
+class ReplayRenderer:
+    def __init__(self, stats):
+        self.stats = stats
+        self.panel_rect = pygame.Rect(WIDTH - 260, 20, 250, 420)
+        x, y = self.panel_rect.topleft
+        self.counters_rect = pygame.Rect(x + 20, y + 20, 210, 70)
+        self.speed_bar_rect = pygame.Rect(x + 20, y + 140, 200, 20)
+        self.pause_button = Button("Pause", (x + 125, y + 280))
+        self.restart_button = Button("Restart", (x + 125, y + 360))
+        self.panel = self.render_panel()
+        self.dirty = []
+        self.shown = None  # (speed, step_count, total_weight, hovered button) currently on the panel
 
-    # Display step and weight information
-    step_text = FONT.render(f"Steps: {step_count}", True, (0, 0, 0))
-    weight_text = FONT.render(f"Weight: {total_weight}", True, (0, 0, 0))
-    speed_text = FONT.render("Speed:", True, (0, 0, 0))
+    # Everything on the control panel that never changes. Transparent outside the rounded corners, so the
+    # grid still shows there when the panel is drawn over it.
+    def render_panel(self):
+        panel = pygame.Surface(self.panel_rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(panel, (200, 200, 200), panel.get_rect(), border_radius=10)
+        panel.blit(render_text(FONT, "Speed:", (0, 0, 0)), (20, 100))
+        panel.blit(render_text(small_font, "Use LEFT and RIGHT", (0, 0, 0)), (20, 170))
+        panel.blit(render_text(small_font, "keys to change speed", (0, 0, 0)), (20, 200))
+        return panel.convert_alpha()
 
-    screen.blit(step_text, (controls_rect.x + 20, controls_rect.y + 20))
-    screen.blit(weight_text, (controls_rect.x + 20, controls_rect.y + 60))
-    
-    # Display speed bar
-    pygame.draw.rect(screen, (200, 200, 200), (controls_rect.x + 20, controls_rect.y + 140, 180, 20))
-    pygame.draw.rect(screen, (0, 128, 255), (controls_rect.x + 20, controls_rect.y + 140, int(speed * 2), 20))
-    screen.blit(speed_text, (controls_rect.x + 20, controls_rect.y + 100))
+    # Restore the static panel underneath part of it before drawing that part again
+    def clear_panel_area(self, rect):
+        screen.blit(self.panel, rect, area=rect.move(-self.panel_rect.x, -self.panel_rect.y))
+        self.dirty.append(rect)
 
-    # Add instructions for changing speed
-    speed_instruction_text_1 = small_font.render("Use LEFT and RIGHT", True, (0, 0, 0))
-    speed_instruction_text_2 = small_font.render("keys to change speed", True, (0, 0, 0))
+    def draw_all(self, grid, speed, step_count, total_weight):
+        screen.fill(BACKGROUND_COLOR)
+        title_text = render_text(FONT, f"Algorithm: {self.stats['algorithm']}", (0, 0, 0))
+        screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 10))
+        for i, row in enumerate(grid):
+            for j, cell in enumerate(row):
+                screen.blit(TILES.get(cell, TILES[" "]), (j * SQUARE_SIZE, HEADER_HEIGHT + i * SQUARE_SIZE))
+        self.draw_panel(speed, step_count, total_weight)
+        self.dirty = [screen.get_rect()]
 
-    screen.blit(speed_instruction_text_1, (controls_rect.x + 20, controls_rect.y + 170))
-    screen.blit(speed_instruction_text_2, (controls_rect.x + 20, controls_rect.y + 200))
+    def draw_panel(self, speed, step_count, total_weight):
+        screen.blit(self.panel, self.panel_rect)
+        self.dirty.append(self.panel_rect)
+        self.shown = None
+        self.draw_controls(speed, step_count, total_weight)
 
-    # Pause/Resume button and Restart button
-    pause_button = Button("Pause", (controls_rect.x + 125, controls_rect.y + 280))
-    restart_button = Button("Restart", (controls_rect.x + 125, controls_rect.y + 360))
+    # Redraw the given grid cells; the panel goes back on top if one of them lies under it
+    def draw_cells(self, grid, cells, speed, step_count, total_weight):
+        under_panel = False
+        for i, j in cells:
+            rect = pygame.Rect(j * SQUARE_SIZE, HEADER_HEIGHT + i * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+            screen.blit(TILES.get(grid[i][j], TILES[" "]), rect)
+            self.dirty.append(rect)
+            under_panel = under_panel or rect.colliderect(self.panel_rect)
+        if under_panel:
+            self.draw_panel(speed, step_count, total_weight)
 
-    pause_button.draw(screen, pygame.mouse.get_pos())
-    restart_button.draw(screen, pygame.mouse.get_pos())
+    # Counters, speed bar and button hover, each redrawn only when it differs from what is on screen.
+    # The counters change every step, so they are rendered directly rather than through the text cache.
+    def draw_controls(self, speed, step_count, total_weight):
+        mouse_pos = pygame.mouse.get_pos()
+        hovered = next((button for button in (self.pause_button, self.restart_button) if button.rect.collidepoint(mouse_pos)), None)
+        redraw_all = self.shown is None
+        if redraw_all or (step_count, total_weight) != self.shown[1:3]:
+            self.clear_panel_area(self.counters_rect)
+            screen.blit(FONT.render(f"Steps: {step_count}", True, (0, 0, 0)), self.counters_rect.topleft)
+            screen.blit(FONT.render(f"Weight: {total_weight}", True, (0, 0, 0)), self.counters_rect.move(0, 40).topleft)
+        if redraw_all or speed != self.shown[0]:
+            self.clear_panel_area(self.speed_bar_rect)
+            pygame.draw.rect(screen, (0, 128, 255), (self.speed_bar_rect.x, self.speed_bar_rect.y, int(speed * 2), 20))
+        for button in (self.pause_button, self.restart_button):
+            if redraw_all or (button is hovered) != (button is self.shown[3]):
+                self.clear_panel_area(button.rect.inflate(20, 20))
+                button.draw(screen, mouse_pos)
+        self.shown = (speed, step_count, total_weight, hovered)
 
-    return pause_button, restart_button
+    def present(self):
+        if self.dirty:
+            pygame.display.update(self.dirty)
+            self.dirty = []
 
 # Function to simulate
 def simulate(grid, path, stats, playing, original_grid, weights, stone_index_list):
@@ -118,31 +203,36 @@ def simulate(grid, path, stats, playing, original_grid, weights, stone_index_lis
         return
 
     action_index = 0  # Track the current action index in the path
+    renderer = ReplayRenderer(stats)
+    renderer.draw_all(grid, speed, step_count, total_weight)
 
     # Main simulation loop
     while action_index < len(path) and playing:
         if not paused:
             # Perform the next action in the path
             action = path[action_index]
-            total_weight = update_grid(grid, action, weights, total_weight, stone_index_list)
+            changed = []
+            total_weight = update_grid(grid, action, weights, total_weight, stone_index_list, changed)
             step_count += 1
             action_index += 1
 
-            # Render updated grid and controls
-            render_simulation(grid, stats, speed)
-            pause_button, restart_button = render_simulation_controls(stats, speed, step_count, total_weight, paused)
-            pygame.display.flip()
-            time.sleep(0.01 * (100 - speed))
+            # Redraw what the action changed
+            renderer.draw_cells(grid, changed, speed, step_count, total_weight)
+        renderer.draw_controls(speed, step_count, total_weight)
+        renderer.present()
+        time.sleep(0.01 * (100 - speed) if not paused else 0.01)
 
         # Event handling for pause, restart, and speed adjustment
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 playing = False
                 return
+            elif event.type == pygame.WINDOWEXPOSED:
+                renderer.draw_all(grid, speed, step_count, total_weight)
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                if pause_button.is_clicked(event.pos):
+                if renderer.pause_button.is_clicked(event.pos):
                     paused = not paused  # Toggle paused state
-                elif restart_button.is_clicked(event.pos):
+                elif renderer.restart_button.is_clicked(event.pos):
                     # Reset grid to original state and restart simulation
                     grid = [row[:] for row in original_grid]  # Deep copy the original grid
                     # Load the index_stone at each cell
@@ -158,26 +248,31 @@ def simulate(grid, path, stats, playing, original_grid, weights, stone_index_lis
                     total_weight = 0
                     action_index = 0  # Reset action index
                     paused = False  # Ensure simulation restarts in the play state
+                    renderer.draw_all(grid, speed, step_count, total_weight)
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_LEFT:
                     speed = max(10, speed - 10)
                 elif event.key == pygame.K_RIGHT:
                     speed = min(100, speed + 10)
 
-    # End of simulation: remove pause instructions and display final state
+    # End of simulation: remove pause instructions and display final state. Nothing changes any more, so
+    # the frame is drawn once and only again when the window needs it.
+    render_simulation(grid, stats, speed, display_end_text=True)
+    pygame.display.flip()
     while playing:
-        render_simulation(grid, stats, speed, display_end_text=True)
-        pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 playing = False
                 return
+            elif event.type == pygame.WINDOWEXPOSED:
+                pygame.display.flip()
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 playing = False
                 return
+        pygame.time.wait(10)
 
 # Simulate each game
-def simulate_single_game(input_file, output_file, weights, no_solution_due_to_cats=False):
+def simulate_single_game(input_file, output_file, weights, no_solution_due_to_cats=False, stats=None):
     grid, _ = load_map(input_file)
 
     #Load the index_stone at each cell
@@ -206,7 +301,8 @@ def simulate_single_game(input_file, output_file, weights, no_solution_due_to_ca
         wait_for_exit()
         return
 
-    stats = parse_output(output_file)
+    if stats is None:
+        stats = parse_output(output_file)
     if 'error' not in stats:
         simulate(grid, stats["path"], stats, playing=True, original_grid=original_grid, weights=weights, stone_index_list= stone_index_list)
     else:
@@ -0,0 +1,61 @@
+import math
+import pygame
+import sys
+from .ui_utility import *
+
+SPINNER_RADIUS = 40
+
+# Shown while a BackgroundSolve runs: a spinner plus the latest statistics of the search, redrawn every
+# frame while the worker process does the solving. Cancel (or ESC) stops the worker.
+# Returns the result dict once the solve is done, or None if it was cancelled.
+def solving_screen(screen, map_number, chosen_algorithm, job):
+    title_text = title_map_font.render(f"Map {map_number}", True, TITLE_COLOR)
+    title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 5))
+    cancel_button = Button("Cancel", (WIDTH // 2, HEIGHT - 40))
+    spinner_center = (WIDTH // 2, HEIGHT // 2 - 40)
+    spinner_rect = pygame.Rect(0, 0, 2 * SPINNER_RADIUS, 2 * SPINNER_RADIUS)
+    spinner_rect.center = spinner_center
+    clock = pygame.time.Clock()
+
+    while not job.poll():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                job.cancel()
+                pygame.quit()
+                sys.exit()
+            elif (event.type == pygame.MOUSEBUTTONDOWN and cancel_button.is_clicked(event.pos)) or \
+                    (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                job.cancel()
+                return None
+
+        screen.fill(BACKGROUND_COLOR)
+        screen.blit(title_text, title_rect)
+
+        # Spinner: a quarter arc going round a faint ring
+        angle = job.elapsed() * 4
+        pygame.draw.circle(screen, HOVER_COLOR, spinner_center, SPINNER_RADIUS, 6)
+        pygame.draw.arc(screen, BUTTON_COLOR, spinner_rect, angle, angle + math.pi / 2, 6)
+
+        # Latest statistics reported by the search
+        lines = [f"Solving with {chosen_algorithm}... {job.elapsed():.1f} s"]
+        progress = job.progress
+        if progress is None:
+            lines.append("Starting the solver...")
+        else:
+            lines.append(f"Nodes: {progress['nodes_generated']:,} ({progress['nodes_per_second']:,.0f} per second)")
+            sizes = []
+            if progress["frontier_size"] is not None:
+                sizes.append(f"Frontier: {progress['frontier_size']:,}")
+            if progress["visited_size"] is not None:
+                sizes.append(f"Visited: {progress['visited_size']:,}")
+            if sizes:
+                lines.append("   ".join(sizes))
+        for index, line in enumerate(lines):
+            text = FONT.render(line, True, (0, 0, 0))
+            screen.blit(text, text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 40 + index * 36)))
+
+        cancel_button.draw(screen, pygame.mouse.get_pos())
+        pygame.display.flip()
+        clock.tick(30)
+
+    return job.result
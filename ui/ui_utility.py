@@ -1,5 +1,6 @@
 import pygame
 import os
+import functools
 
 # Initialize Pygame
 pygame.init()
@@ -37,17 +38,31 @@ FONT = pygame.font.Font(None, 36)
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 items_folder = os.path.join(project_root, "items")
 
-# Load images dynamically using the constructed path
+# Load images dynamically using the constructed path. convert_alpha() turns them into the display's pixel
+# format once, instead of converting on every blit.
 IMAGES = {
-    "#": pygame.image.load(os.path.join(items_folder, "wall.png")),
-    " ": pygame.image.load(os.path.join(items_folder, "floor.png")),
-    "$": pygame.image.load(os.path.join(items_folder, "knitting_ball.png")),
-    ".": pygame.image.load(os.path.join(items_folder, "basket.png")),
-    "*": pygame.image.load(os.path.join(items_folder, "ball_in_basket.png")),
-    "+": pygame.image.load(os.path.join(items_folder, "cat_in_basket.png")),
-    "@": pygame.image.load(os.path.join(items_folder, "cat.png")),
+    "#": pygame.image.load(os.path.join(items_folder, "wall.png")).convert_alpha(),
+    " ": pygame.image.load(os.path.join(items_folder, "floor.png")).convert_alpha(),
+    "$": pygame.image.load(os.path.join(items_folder, "knitting_ball.png")).convert_alpha(),
+    ".": pygame.image.load(os.path.join(items_folder, "basket.png")).convert_alpha(),
+    "*": pygame.image.load(os.path.join(items_folder, "ball_in_basket.png")).convert_alpha(),
+    "+": pygame.image.load(os.path.join(items_folder, "cat_in_basket.png")).convert_alpha(),
+    "@": pygame.image.load(os.path.join(items_folder, "cat.png")).convert_alpha(),
 }
 
+# The same images already drawn over the background color, as opaque surfaces: a grid cell then takes one
+# plain copy to draw, and redrawing a single cell needs nothing underneath it cleared first.
+TILES = {}
+for cell, image in IMAGES.items():
+    TILES[cell] = pygame.Surface(image.get_size()).convert()
+    TILES[cell].fill(BACKGROUND_COLOR)
+    TILES[cell].blit(image, (0, 0))
+
+# Rendered text, kept for labels that are drawn over and over with the same content
+@functools.lru_cache(maxsize=256)
+def render_text(font, text, color):
+    return font.render(text, True, color)
+
 # Function to load map from file
 def load_map(file_path, skip_first_line=True):
     try:
@@ -81,7 +96,7 @@ def render_simulation(grid, stats, speed, display_end_text=False, no_solution=Fa
     screen.fill(BACKGROUND_COLOR)
     
     # Display algorithm name or "No solution"
-    title_text = FONT.render("No solution for this map" if no_solution else f"Algorithm: {stats['algorithm']}", True, (255, 0, 0) if no_solution else (0, 0, 0))
+    title_text = render_text(FONT, "No solution for this map" if no_solution else f"Algorithm: {stats['algorithm']}", (255, 0, 0) if no_solution else (0, 0, 0))
     screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 10))
 
     # Render grid
@@ -89,15 +104,15 @@ def render_simulation(grid, stats, speed, display_end_text=False, no_solution=Fa
         for i, row in enumerate(grid):
             for j, cell in enumerate(row):
                 x, y = j * SQUARE_SIZE, HEADER_HEIGHT + i * SQUARE_SIZE
-                screen.blit(IMAGES.get(cell, IMAGES[" "]), (x, y))
+                screen.blit(TILES.get(cell, TILES[" "]), (x, y))
 
     # Display stats if applicable
     if display_end_text and not no_solution:
-        step_text = FONT.render(f"Steps: {stats['steps']}", True, (0, 0, 0))
-        weight_text = FONT.render(f"Weight: {stats['total_weight']} $", True, (0, 0, 0))
-        nodes_text = FONT.render(f"Nodes: {stats['nodes_generated']}", True, (0, 0, 0))
-        time_text = FONT.render(f"Time: {stats['time_taken']} seconds", True, (0, 0, 0))
-        memory_text = FONT.render(f"Memory: {stats['memory_used']} KB", True, (0, 0, 0))
+        step_text = render_text(FONT, f"Steps: {stats['steps']}", (0, 0, 0))
+        weight_text = render_text(FONT, f"Weight: {stats['total_weight']} $", (0, 0, 0))
+        nodes_text = render_text(FONT, f"Nodes: {stats['nodes_generated']}", (0, 0, 0))
+        time_text = render_text(FONT, f"Time: {stats['time_taken']} seconds", (0, 0, 0))
+        memory_text = render_text(FONT, f"Memory: {stats['memory_used']} KB", (0, 0, 0))
 
         # Position each text vertically
         screen.blit(step_text, (WIDTH - 300, HEIGHT - 220 + HEADER_HEIGHT))
@@ -107,7 +122,7 @@ def render_simulation(grid, stats, speed, display_end_text=False, no_solution=Fa
         screen.blit(memory_text, (WIDTH - 300, HEIGHT - 100 + HEADER_HEIGHT))
 
         # Display navigation exit message
-        exit_text = FONT.render("Press ESC to exit", True, (0, 0, 0))
+        exit_text = render_text(FONT, "Press ESC to exit", (0, 0, 0))
         screen.blit(exit_text, (WIDTH // 2 - exit_text.get_width() // 2, HEIGHT + HEADER_HEIGHT - 10))
 
 # Button classes and functions
@@ -128,10 +143,14 @@ class Button:
     def is_clicked(self, mouse_pos):
         return self.rect.collidepoint(mouse_pos)
 
+THUMBNAIL_SIZE = (260, 120)  # Layout area of a MapButton
+
 class MapButton:
-    def __init__(self, text, pos):
+    # thumbnail is the map pre-rendered to fit in THUMBNAIL_SIZE (see MapEntry.get_thumbnail)
+    def __init__(self, text, pos, thumbnail=None):
         self.text = text
         self.pos = pos
+        self.thumbnail = thumbnail
         self.rendered_text = button_map_font.render(self.text, True, WHITE)
         self.rect = pygame.Rect(0, 0, 300, 180)  # Large rectangle for map layout
         self.rect.center = self.pos
@@ -140,16 +159,12 @@ class MapButton:
         color = HOVER_COLOR if self.rect.collidepoint(mouse_pos) else BUTTON_COLOR
         pygame.draw.rect(screen, color, self.rect, border_radius=10)
 
-        # Draw the layout preview (placeholder for map layout)
+        # Draw the layout preview, centered in its area
         layout_color = (200, 200, 200)
-        layout_rect = pygame.Rect(self.rect.x + 20, self.rect.y + 20, 260, 120)
+        layout_rect = pygame.Rect((self.rect.x + 20, self.rect.y + 20), THUMBNAIL_SIZE)
         pygame.draw.rect(screen, layout_color, layout_rect)
-
-        # Draw some example walls or obstacles within the layout
-        obstacle_color = (150, 150, 150)
-        pygame.draw.rect(screen, obstacle_color, (layout_rect.x + 20, layout_rect.y + 60, 30, 30))
-        pygame.draw.rect(screen, obstacle_color, (layout_rect.x + 100, layout_rect.y + 80, 20, 20))
-        pygame.draw.rect(screen, obstacle_color, (layout_rect.x + 150, layout_rect.y + 50, 15, 50))
+        if self.thumbnail:
+            screen.blit(self.thumbnail, self.thumbnail.get_rect(center=layout_rect.center))
 
         screen.blit(self.rendered_text, self.rendered_text.get_rect(center=(self.rect.centerx, self.rect.centery + 70)))
 